@@ -0,0 +1,4 @@
+"""Performance benchmarks for the Kelvo E-Comm Python Lambda functions.
+
+Run from backend/python-lambdas, e.g. ``python -m benchmarks.bench_serialization``.
+"""
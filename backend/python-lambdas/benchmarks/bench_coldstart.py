@@ -0,0 +1,151 @@
+"""Cold-start benchmark for the Python Lambda handlers, with an enforced budget.
+
+For each lambda, imports ``<lambda>.handler`` in a fresh interpreter under
+``python -X importtime`` and reports the cumulative import time of the
+handler module. Modules the Lambda runtime has already loaded before it
+imports a handler (logging, json, ...) are preloaded so they are not
+attributed to the handler. A second fresh interpreter times the first
+invocation, which is where lazily imported dependencies and the catalog
+are now loaded.
+
+The run fails (exit status 1) if the median import time of any handler
+exceeds its budget, or if a heavy dependency is imported at module load.
+CI runs it on every change to the lambdas
+(.github/workflows/python-lambdas-coldstart.yml).
+
+Usage:
+    python -m benchmarks.bench_coldstart [--runs N] [--budget-ms MS] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+LAMBDA_ROOT = Path(__file__).resolve().parent.parent
+
+# Import-time budget per handler module, in milliseconds
+BUDGETS_MS = {
+    "search": 30.0,
+    "recommendations": 30.0,
+    "notifications": 30.0,
+}
+
+# Modules that must not be imported when a handler module is loaded
+DEFERRED_MODULES = ("ddtrace", "datadog_lambda", "orjson", "ujson", "brotli")
+
+# Already imported by the Lambda runtime bootstrap before the handler is loaded
+RUNTIME_PRELOADED = "import json, logging, os, re, typing, decimal, traceback"
+
+FIRST_EVENTS = {
+    "search": {"path": "/api/search", "httpMethod": "GET", "queryStringParameters": {"q": "pro"}},
+    "recommendations": {"path": "/api/recommendations", "httpMethod": "GET", "queryStringParameters": {"productId": "1"}},
+    "notifications": {
+        "path": "/api/notifications/shipping-update",
+        "httpMethod": "POST",
+        "body": json.dumps({"orderId": "1", "customerEmail": "a@b.c", "trackingNumber": "T1", "status": "SHIPPED"}),
+    },
+}
+
+
+def _run(code: str, importtime: bool = False) -> subprocess.CompletedProcess[str]:
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", code]
+    env = {**os.environ, "PYTHONPATH": str(LAMBDA_ROOT), "PYTHONDONTWRITEBYTECODE": "1"}
+    return subprocess.run(command, cwd=LAMBDA_ROOT, env=env, capture_output=True, text=True, check=True)
+
+
+def measure_import(name: str) -> tuple[float, set[str]]:
+    """Return (cumulative import ms of <name>.handler, top-level packages imported with it)."""
+    result = _run(f"{RUNTIME_PRELOADED}\nimport {name}.handler", importtime=True)
+    cumulative_us = None
+    imported: set[str] = set()
+    seen_preamble = False
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, module = line.split("|")
+        module = module.strip()
+        if module == name:
+            seen_preamble = True
+        if seen_preamble:
+            imported.add(module.split(".")[0])
+        if module == f"{name}.handler":
+            cumulative_us = int(cumulative)
+    if cumulative_us is None:
+        raise RuntimeError(f"No importtime entry for {name}.handler:\n{result.stderr[-2000:]}")
+    return cumulative_us / 1000, imported
+
+
+def measure_first_invocation(name: str) -> float:
+    """Return ms spent in the first _handler call of a fresh interpreter."""
+    code = (
+        "import json, time\n"
+        f"from {name}.handler import _handler\n"
+        f"event = json.loads({json.dumps(json.dumps(FIRST_EVENTS[name]))})\n"
+        "start = time.perf_counter()\n"
+        "_handler(event, None)\n"
+        "print((time.perf_counter() - start) * 1000)\n"
+    )
+    return float(_run(code).stdout.strip().splitlines()[-1])
+
+
+def run(runs: int, budget_ms: float | None) -> list[dict[str, Any]]:
+    """Measure every lambda and compare the median import time with its budget."""
+    results = []
+    for name, default_budget in BUDGETS_MS.items():
+        import_ms = []
+        imported: set[str] = set()
+        for _ in range(runs):
+            ms, modules = measure_import(name)
+            import_ms.append(ms)
+            imported |= modules
+        first_ms = [measure_first_invocation(name) for _ in range(runs)]
+        budget = budget_ms if budget_ms is not None else default_budget
+        median_import = statistics.median(import_ms)
+        deferred_loaded = sorted(imported.intersection(DEFERRED_MODULES))
+        results.append(
+            {
+                "lambda": name,
+                "import_ms_median": median_import,
+                "import_ms_min": min(import_ms),
+                "first_invocation_ms_median": statistics.median(first_ms),
+                "budget_ms": budget,
+                "eagerly_imported": deferred_loaded,
+                "ok": median_import <= budget and not deferred_loaded,
+            }
+        )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=7, help="fresh interpreters per lambda")
+    parser.add_argument("--budget-ms", type=float, help="override the per-lambda import budget")
+    parser.add_argument("--json", action="store_true", help="emit machine-readable JSON")
+    args = parser.parse_args()
+
+    results = run(args.runs, args.budget_ms)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'lambda':<16} {'import ms':>10} {'first call ms':>14} {'budget':>8}  status")
+        for r in results:
+            status = "ok" if r["ok"] else "FAIL"
+            if r["eagerly_imported"]:
+                status += f" (eager: {', '.join(r['eagerly_imported'])})"
+            print(
+                f"{r['lambda']:<16} {r['import_ms_median']:>10.1f} {r['first_invocation_ms_median']:>14.1f} "
+                f"{r['budget_ms']:>8.1f}  {status}"
+            )
+    if not all(r["ok"] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark of response compression CPU cost versus bytes saved.
+
+Compresses realistic search and recommendation bodies with gzip (and
+brotli, if installed) at several levels and reports the time per call,
+compressed size, and the size after base64 encoding for API Gateway.
+
+Usage:
+    python -m benchmarks.bench_compression [--number N] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import gzip
+import json
+import timeit
+from typing import Any, Callable
+
+from shared import utils
+from shared.catalog import get_catalog
+from shared.utils import products_response
+
+GZIP_LEVELS = (1, 4, 6, 9)
+BROTLI_QUALITIES = (1, 4, 6, 11)
+
+
+def _bodies() -> dict[str, bytes]:
+    """Encoded response bodies as produced by the search/recommendation handlers."""
+    products = list(get_catalog().products)
+    pro = [p for p in products if "pro" in p["name"].lower() or "pro" in p["description"].lower()]
+    responses = {
+        "search_all": products_response("products", products, {"count": len(products)}),
+        "search_query": products_response("products", pro, {"count": len(pro)}),
+        "recommendations_4": products_response("recommendations", products[:4]),
+    }
+    return {name: r["body"].encode("utf-8") for name, r in responses.items()}
+
+
+def _codecs() -> dict[str, Callable[[bytes], bytes]]:
+    codecs: dict[str, Callable[[bytes], bytes]] = {
+        f"gzip-{level}": (lambda data, level=level: gzip.compress(data, compresslevel=level, mtime=0))
+        for level in GZIP_LEVELS
+    }
+    brotli = utils.load_brotli()
+    if brotli is not None:
+        for quality in BROTLI_QUALITIES:
+            codecs[f"br-{quality}"] = lambda data, quality=quality: brotli.compress(data, quality=quality)
+    return codecs
+
+
+def run(number: int) -> list[dict[str, Any]]:
+    """Time every codec on every body."""
+    results = []
+    for name, data in _bodies().items():
+        for codec, compress in _codecs().items():
+            seconds = min(timeit.repeat(lambda: compress(data), number=number, repeat=5))
+            compressed = compress(data)
+            results.append(
+                {
+                    "payload": name,
+                    "codec": codec,
+                    "bytes": len(data),
+                    "compressed_bytes": len(compressed),
+                    "base64_bytes": len(base64.b64encode(compressed)),
+                    "saved_pct": 100.0 * (1 - len(compressed) / len(data)),
+                    "us_per_call": seconds / number * 1e6,
+                }
+            )
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=500, help="calls per timing run")
+    parser.add_argument("--json", action="store_true", help="emit machine-readable JSON")
+    args = parser.parse_args()
+
+    results = run(args.number)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'payload':<18} {'codec':<8} {'bytes':>7} {'compr':>7} {'base64':>7} {'saved%':>7} {'us/call':>9}")
+    for r in results:
+        print(
+            f"{r['payload']:<18} {r['codec']:<8} {r['bytes']:>7} {r['compressed_bytes']:>7} "
+            f"{r['base64_bytes']:>7} {r['saved_pct']:>7.1f} {r['us_per_call']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
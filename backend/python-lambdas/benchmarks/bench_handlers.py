@@ -0,0 +1,285 @@
+"""Reproducible end-to-end benchmark of the three lambda handlers.
+
+For each catalog size, generates a synthetic catalog (benchmarks.catalog_gen),
+installs it as the active catalog, and replays a seeded, realistic request
+mix against ``search._handler``, ``recommendations._handler`` and
+``notifications._handler`` in process. Reports per handler:
+
+    throughput (requests/s), p50/p99/mean latency (us), and the peak
+    Python allocation during a replay (tracemalloc)
+
+plus the catalog load time and peak memory per size. Results are JSON
+(--json / --output) so runs can be stored and compared: with --baseline,
+any handler whose throughput drops or p99 rises by more than --tolerance
+relative to the stored run is reported and the exit status is 1.
+
+Usage:
+    python -m benchmarks.bench_handlers [--sizes 52,1000,10000] [--requests 5000] [--skew 0.8]
+        [--seed 1] [--json] [--output run.json] [--baseline run.json] [--tolerance 0.15]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable
+
+from benchmarks.catalog_gen import ADJECTIVES, CATEGORIES, parse_categories, write_catalog
+from notifications.handler import _handler as notifications_handler
+from recommendations.handler import _handler as recommendations_handler
+from search.handler import _handler as search_handler
+from shared import utils
+from shared.catalog import get_catalog, load_catalog, set_catalog
+from shared.tracing import get_trace_mode
+
+Event = dict[str, Any]
+
+BROWSER_HEADERS = {"Accept-Encoding": "gzip, deflate, br", "Accept": "application/json"}
+
+SEARCH_TERMS = [a.lower() for a in ADJECTIVES] + [n.lower() for _, nouns in CATEGORIES.values() for n in nouns] + [
+    "pro",
+    "set",
+    "e",
+    "zzz",
+]
+
+
+def _get(path: str, params: dict[str, str], headers: dict[str, str] | None = None) -> Event:
+    return {
+        "path": path,
+        "httpMethod": "GET",
+        "queryStringParameters": params,
+        "headers": {**BROWSER_HEADERS, **(headers or {})},
+    }
+
+
+def search_events(rng: random.Random, count: int, categories: list[str]) -> list[Event]:
+    """Search mix: text queries, category browsing, price ranges, sorts, revalidations, bad input."""
+    events = []
+    for _ in range(count):
+        roll = rng.random()
+        params: dict[str, str] = {}
+        if roll < 0.35:
+            params["q"] = rng.choice(SEARCH_TERMS)
+        elif roll < 0.60:
+            params["category"] = rng.choice(categories)
+        elif roll < 0.75:
+            low = rng.choice([0, 10, 25, 50, 100])
+            params.update(category=rng.choice(categories), minPrice=str(low), maxPrice=str(low * 4 + 50))
+        elif roll < 0.85:
+            params.update(q=rng.choice(SEARCH_TERMS), sort=rng.choice(["price_asc", "price_desc"]))
+        elif roll < 0.95:
+            params["sort"] = rng.choice(["name", "price_asc", "price_desc"])
+        else:
+            params[rng.choice(["sort", "minPrice"])] = "bogus"
+        events.append(_get("/api/search", params))
+    return events
+
+
+def recommendation_events(rng: random.Random, count: int, size: int) -> list[Event]:
+    """Recommendations mix: product pages, featured lists, unknown ids, bad input."""
+    events = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.70:
+            params = {"productId": str(rng.randint(1, size))}
+        elif roll < 0.90:
+            params = {"limit": str(rng.choice([4, 8, 12, 20]))}
+        elif roll < 0.95:
+            params = {"productId": str(size + rng.randint(1, 1000))}
+        else:
+            params = {"productId": "abc"}
+        events.append(_get("/api/recommendations", params))
+    return events
+
+
+def notification_events(rng: random.Random, count: int) -> list[Event]:
+    """Notifications mix: order confirmations and shipping updates, with some invalid bodies."""
+    events = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < 0.45:
+            body: str = json.dumps(
+                {
+                    "orderId": f"ord-{i}",
+                    "customerEmail": f"user{i}@example.com",
+                    "customerName": "Test User",
+                    "items": [{"productId": rng.randint(1, 50), "quantity": rng.randint(1, 3)}] * rng.randint(1, 5),
+                    "totalAmount": round(rng.uniform(5, 500), 2),
+                }
+            )
+            path = "/api/notifications/order-confirmation"
+        elif roll < 0.90:
+            body = json.dumps(
+                {"orderId": f"ord-{i}", "customerEmail": f"user{i}@example.com", "trackingNumber": f"TRK{i}", "status": "SHIPPED"}
+            )
+            path = "/api/notifications/shipping-update"
+        elif roll < 0.95:
+            body, path = "{not json", "/api/notifications/shipping-update"
+        else:
+            body, path = json.dumps({"orderId": f"ord-{i}"}), "/api/notifications/order-confirmation"
+        events.append({"path": path, "httpMethod": "POST", "body": body, "headers": {"Content-Type": "application/json"}})
+    return events
+
+
+def add_revalidations(handler: Callable[[Event, Any], Event], events: list[Event], rng: random.Random, share: float) -> None:
+    """Turn a share of the events into conditional requests repeating an earlier response's ETag."""
+    etags: dict[int, str] = {}
+    for i, event in enumerate(events):
+        if rng.random() < share and i > 0:
+            source = rng.randrange(i)
+            if source not in etags:
+                etags[source] = handler(events[source], None)["headers"].get("ETag", "")
+            event["headers"] = {**event["headers"], "If-None-Match": etags[source]}
+
+
+def _percentile(sorted_values: list[int], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, max(0, int(round(q * len(sorted_values))) - 1))]
+
+
+def replay(handler: Callable[[Event, Any], Event], events: list[Event]) -> dict[str, Any]:
+    """Replay events sequentially; latency of every call plus a separate traced pass for peak memory."""
+    for event in events[: min(len(events), 500)]:
+        handler(event, None)
+
+    latencies = []
+    clock = time.perf_counter_ns
+    gc.collect()
+    started = clock()
+    for event in events:
+        t0 = clock()
+        handler(event, None)
+        latencies.append(clock() - t0)
+    elapsed = (clock() - started) / 1e9
+
+    tracemalloc.start()
+    for event in events[: min(len(events), 500)]:
+        handler(event, None)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "requests": len(events),
+        "rps": len(events) / elapsed,
+        "p50_us": _percentile(latencies, 0.50) / 1000,
+        "p99_us": _percentile(latencies, 0.99) / 1000,
+        "mean_us": sum(latencies) / len(latencies) / 1000,
+        "peak_alloc_bytes": peak,
+    }
+
+
+def run(sizes: list[int], requests: int, seed: int, skew: float, categories_spec: str | None) -> dict[str, Any]:
+    categories, weights = parse_categories(categories_spec, skew)
+    results = []
+    catalogs = []
+    original = get_catalog()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for size in sizes:
+                path = os.path.join(tmp, f"catalog-{size}.jsonl")
+                write_catalog(path, size, categories, weights, seed)
+                catalog = load_catalog(path, measure_memory=True)
+                set_catalog(catalog)
+                catalogs.append(
+                    {
+                        "catalog_size": size,
+                        "snapshot_bytes": catalog.stats.snapshot_bytes,
+                        "load_ms": catalog.stats.load_seconds * 1000,
+                        "peak_memory_bytes": catalog.stats.peak_memory_bytes,
+                    }
+                )
+
+                rng = random.Random(f"{seed}-{size}")
+                workloads: dict[str, tuple[Callable[[Event, Any], Event], list[Event]]] = {
+                    "search": (search_handler, search_events(rng, requests, categories)),
+                    "recommendations": (recommendations_handler, recommendation_events(rng, requests, size)),
+                }
+                for handler, events in workloads.values():
+                    add_revalidations(handler, events, rng, 0.10)
+                for name, (handler, events) in workloads.items():
+                    results.append({"lambda": name, "catalog_size": size, **replay(handler, events)})
+
+            events = notification_events(random.Random(seed), requests)
+            results.append({"lambda": "notifications", "catalog_size": None, **replay(notifications_handler, events)})
+    finally:
+        set_catalog(original)
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "json_backend": utils.get_json_backend(),
+            "trace_mode": get_trace_mode(),
+            "seed": seed,
+            "skew": skew,
+            "categories": categories_spec,
+            "requests": requests,
+        },
+        "catalogs": catalogs,
+        "results": results,
+    }
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Regressions of report against baseline, as human-readable lines."""
+    previous = {(r["lambda"], r["catalog_size"]): r for r in baseline["results"]}
+    regressions = []
+    for r in report["results"]:
+        base = previous.get((r["lambda"], r["catalog_size"]))
+        if base is None:
+            continue
+        label = f"{r['lambda']} (catalog {r['catalog_size']})"
+        if r["rps"] < base["rps"] * (1 - tolerance):
+            regressions.append(f"{label}: throughput {r['rps']:.0f} req/s vs {base['rps']:.0f} baseline")
+        if r["p99_us"] > base["p99_us"] * (1 + tolerance):
+            regressions.append(f"{label}: p99 {r['p99_us']:.1f}us vs {base['p99_us']:.1f}us baseline")
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="52,1000,10000", help="comma-separated catalog sizes")
+    parser.add_argument("--requests", type=int, default=5000, help="requests per handler and size")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--skew", type=float, default=0.8, help="Zipf exponent of the category distribution")
+    parser.add_argument("--categories", help='comma-separated "Name=weight" list (default: the real categories)')
+    parser.add_argument("--json", action="store_true", help="print the JSON report")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--baseline", help="JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed relative regression")
+    args = parser.parse_args()
+
+    report = run([int(s) for s in args.sizes.split(",")], args.requests, args.seed, args.skew, args.categories)
+    if args.output:
+        with open(args.output, "w") as out:
+            json.dump(report, out, indent=2)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print(f"{'lambda':<16} {'catalog':>8} {'req/s':>9} {'p50 us':>8} {'p99 us':>8} {'peak KiB':>9}")
+        for r in report["results"]:
+            print(
+                f"{r['lambda']:<16} {str(r['catalog_size'] or '-'):>8} {r['rps']:>9.0f} {r['p50_us']:>8.1f} "
+                f"{r['p99_us']:>8.1f} {r['peak_alloc_bytes'] / 1024:>9.1f}"
+            )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(report, json.load(f), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
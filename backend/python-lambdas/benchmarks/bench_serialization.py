@@ -0,0 +1,87 @@
+"""Micro-benchmark of json_response serializer backends.
+
+Encodes realistic search and recommendation payloads with every installed
+backend and reports the per-call cost, both for full encoding and for the
+products_response path that joins pre-encoded product fragments.
+
+Usage:
+    python -m benchmarks.bench_serialization [--number N] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import timeit
+from typing import Any
+
+from shared import utils
+from shared.catalog import get_catalog
+from shared.utils import ProductFragmentCache, json_response, products_response
+
+
+def _payloads() -> dict[str, Any]:
+    """Response bodies shaped like the ones the search/recommendation handlers return."""
+    products = list(get_catalog().products)
+    electronics = [p for p in products if p["category"] == "Electronics"]
+    pro = [p for p in products if "pro" in p["name"].lower() or "pro" in p["description"].lower()]
+    return {
+        "search_all": {"products": products, "count": len(products)},
+        "search_query": {"products": pro, "count": len(pro)},
+        "search_category": {"products": electronics, "count": len(electronics)},
+        "recommendations_4": {"recommendations": electronics[:4]},
+        "recommendations_20": {"recommendations": products[:20]},
+    }
+
+
+def run(number: int) -> list[dict[str, Any]]:
+    """Time json_response for every (backend, payload) pair."""
+    results = []
+    original = utils.get_json_backend()
+    try:
+        for backend in utils.JSON_BACKENDS:
+            try:
+                utils.set_json_backend(backend)
+            except ImportError:
+                continue
+            fragments = ProductFragmentCache(list(get_catalog().products))
+            for name, body in _payloads().items():
+                key = next(iter(body))
+                extra = {k: v for k, v in body.items() if k != key}
+                modes = {
+                    "encode": lambda: json_response(body),
+                    "fragments": lambda: products_response(key, body[key], extra, fragments=fragments),
+                }
+                for mode, call in modes.items():
+                    seconds = min(timeit.repeat(call, number=number, repeat=5))
+                    results.append(
+                        {
+                            "backend": backend,
+                            "mode": mode,
+                            "payload": name,
+                            "bytes": len(call()["body"].encode("utf-8")),
+                            "us_per_call": seconds / number * 1e6,
+                        }
+                    )
+    finally:
+        utils.set_json_backend(original)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=2000, help="calls per timing run")
+    parser.add_argument("--json", action="store_true", help="emit machine-readable JSON")
+    args = parser.parse_args()
+
+    results = run(args.number)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'backend':<8} {'mode':<10} {'payload':<20} {'bytes':>7} {'us/call':>9}")
+    for r in results:
+        print(f"{r['backend']:<8} {r['mode']:<10} {r['payload']:<20} {r['bytes']:>7} {r['us_per_call']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""Request coalescing under a burst of identical concurrent requests.
+
+Installs a synthetic catalog, then has --threads threads send the same
+search and recommendations requests at the same moment, --bursts times,
+once with single-flight coalescing off and once with it on. Reports per
+handler and mode the wall time per burst, the mean and max request
+latency, and how many times the response was actually computed.
+
+Requests only overlap, and so only coalesce, when they run longer than the
+interpreter's thread switch interval (5 ms by default); shorter ones run
+back to back on the GIL. Hence the large default catalog, where an
+unpaginated category listing takes tens of milliseconds.
+
+Usage:
+    python -m benchmarks.bench_singleflight [--size 50000] [--threads 32] [--bursts 20] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable
+
+from benchmarks.catalog_gen import write_catalog
+from recommendations import handler as recommendations
+from search import handler as search
+from shared.catalog import get_catalog, load_catalog, set_catalog
+
+Event = dict[str, Any]
+
+WORKLOADS: dict[str, tuple[Any, Event]] = {
+    "search": (
+        search,
+        {"path": "/api/search", "httpMethod": "GET", "queryStringParameters": {"category": "Electronics", "sort": "price_asc"}},
+    ),
+    "recommendations": (
+        recommendations,
+        {"path": "/api/recommendations", "httpMethod": "GET", "queryStringParameters": {"productId": "7", "limit": "20"}},
+    ),
+}
+
+
+def burst(handler: Callable[[Event, Any], Event], event: Event, threads: int) -> tuple[float, list[float]]:
+    """Release threads identical requests at once; wall time and per-request latencies in seconds."""
+    barrier = threading.Barrier(threads + 1)
+    latencies = [0.0] * threads
+
+    def send(i: int) -> None:
+        barrier.wait()
+        start = time.perf_counter()
+        response = handler(event, None)
+        latencies[i] = time.perf_counter() - start
+        assert response["statusCode"] == 200, response
+
+    workers = [threading.Thread(target=send, args=(i,)) for i in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start, latencies
+
+
+def run(size: int, threads: int, bursts: int) -> list[dict[str, Any]]:
+    results = []
+    original = get_catalog()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "catalog.jsonl")
+            write_catalog(path, size, seed=1)
+            set_catalog(load_catalog(path))
+            for name, (module, event) in WORKLOADS.items():
+                for enabled in (False, True):
+                    module.flights.enabled = enabled
+                    serialized = module.stats.histogram("serialize")
+                    computed = serialized.count
+                    walls, latencies = [], []
+                    for _ in range(bursts):
+                        wall, times = burst(module._handler, event, threads)
+                        walls.append(wall)
+                        latencies += times
+                    results.append(
+                        {
+                            "lambda": name,
+                            "singleflight": enabled,
+                            "requests": len(latencies),
+                            "computed": serialized.count - computed,
+                            "burst_ms": sum(walls) / len(walls) * 1000,
+                            "mean_ms": sum(latencies) / len(latencies) * 1000,
+                            "max_ms": max(latencies) * 1000,
+                        }
+                    )
+                module.flights.enabled = True
+    finally:
+        set_catalog(original)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=50000, help="catalog size")
+    parser.add_argument("--threads", type=int, default=32, help="concurrent identical requests per burst")
+    parser.add_argument("--bursts", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="print the JSON report")
+    args = parser.parse_args()
+
+    results = run(args.size, args.threads, args.bursts)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'lambda':<16} {'coalesce':>8} {'requests':>9} {'computed':>9} {'burst ms':>9} {'mean ms':>8} {'max ms':>8}")
+    for r in results:
+        print(
+            f"{r['lambda']:<16} {'on' if r['singleflight'] else 'off':>8} {r['requests']:>9} {r['computed']:>9} "
+            f"{r['burst_ms']:>9.2f} {r['mean_ms']:>8.2f} {r['max_ms']:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
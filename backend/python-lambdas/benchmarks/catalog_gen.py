@@ -0,0 +1,149 @@
+"""Synthetic product catalogs for benchmarks.
+
+Generates catalogs of any size in the served product schema
+(shared.catalog.PRODUCT_FIELDS), with a configurable category distribution,
+and writes them as JSON-lines snapshots that load_catalog() reads. Output
+is fully determined by the seed.
+
+Names and descriptions are drawn from small per-category vocabularies, so
+substring searches ("pro", "wireless", ...) have realistic selectivity.
+Prices are log-normally distributed around the real catalog's range.
+
+Usage:
+    python -m benchmarks.catalog_gen --size 50000 [--skew 1.1] [--categories Electronics=3,Books=1] [--seed 1] -o catalog.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import random
+from typing import Any
+
+from shared.catalog import write_snapshot
+
+# Category -> (SKU prefix, product nouns), matching the real catalog's categories
+CATEGORIES = {
+    "Electronics": ("ELEC", ("Headphones", "Laptop", "Smartwatch", "Speaker", "Camera", "Tablet", "Charger", "Monitor")),
+    "Clothing": ("CLTH", ("Jacket", "T-Shirt", "Jeans", "Sneakers", "Hoodie", "Dress", "Scarf", "Boots")),
+    "Home & Kitchen": ("HOME", ("Blender", "Cookware Set", "Coffee Maker", "Knife Set", "Lamp", "Pillow", "Kettle", "Rug")),
+    "Sports": ("SPRT", ("Yoga Mat", "Dumbbells", "Running Shoes", "Water Bottle", "Tent", "Bike Helmet", "Backpack", "Jump Rope")),
+    "Beauty": ("BEAU", ("Serum", "Moisturizer", "Lipstick", "Shampoo", "Perfume", "Face Mask", "Hair Dryer", "Sunscreen")),
+    "Books": ("BOOK", ("Cookbook", "Novel", "Guide", "Biography", "Atlas", "Workbook", "Anthology", "Handbook")),
+    "Toys & Games": ("TOYS", ("Puzzle", "Board Game", "Building Set", "Plush Toy", "Card Game", "RC Car", "Doll", "Kite")),
+}
+
+ADJECTIVES = (
+    "Wireless", "Premium", "Ultra-Slim", "Pro", "Classic", "Organic", "Smart", "Compact",
+    "Deluxe", "Portable", "Ergonomic", "Vintage", "Eco", "Advanced", "Essential", "Lightweight",
+)
+
+FEATURES = (
+    "with long battery life", "made from recycled materials", "for everyday use", "with a two-year warranty",
+    "in a gift-ready box", "designed for travel", "with quick setup", "for beginners and pros",
+    "with water resistance", "crafted by hand", "with adjustable settings", "in five colours",
+)
+
+
+def category_weights(categories: list[str], skew: float) -> list[float]:
+    """Zipf-like weights: the k-th category gets 1 / k**skew (skew 0 is uniform)."""
+    return [1 / (rank**skew) for rank in range(1, len(categories) + 1)]
+
+
+def parse_categories(spec: str | None, skew: float) -> tuple[list[str], list[float]]:
+    """Categories and weights from ``"Name=weight,..."``, or all of CATEGORIES.
+
+    Without explicit weights, the listed order is ranked by skew.
+    """
+    if not spec:
+        names = list(CATEGORIES)
+        return names, category_weights(names, skew)
+    names, weights = [], []
+    for item in spec.split(","):
+        name, _, weight = item.partition("=")
+        names.append(name.strip())
+        weights.append(float(weight) if weight else 1.0)
+    if "=" not in spec:
+        weights = category_weights(names, skew)
+    return names, weights
+
+
+def _slugify(text: str) -> str:
+    return "-".join("".join(c if c.isalnum() else " " for c in text.lower()).split())
+
+
+def generate_products(
+    size: int,
+    categories: list[str] | None = None,
+    weights: list[float] | None = None,
+    seed: int = 0,
+) -> list[dict[str, Any]]:
+    """Generate size products in the served schema.
+
+    Args:
+        size: Number of products.
+        categories: Category names; unknown names get generic nouns.
+        weights: Relative frequency of each category (default uniform).
+        seed: Random seed; the same arguments always give the same catalog.
+
+    Returns:
+        Products with ids 1..size.
+    """
+    rng = random.Random(seed)
+    categories = categories or list(CATEGORIES)
+    weights = weights or [1.0] * len(categories)
+    counters: dict[str, int] = {}
+    products = []
+    for product_id in range(1, size + 1):
+        category = rng.choices(categories, weights)[0]
+        prefix, nouns = CATEGORIES.get(category, (category[:4].upper(), ("Item", "Kit", "Set", "Pack")))
+        counters[category] = counters.get(category, 0) + 1
+        adjective = rng.choice(ADJECTIVES)
+        noun = rng.choice(nouns)
+        name = f"{adjective} {noun} {rng.choice('ABCDEFGHJK')}{rng.randint(1, 999)}"
+        slug = f"{_slugify(name)}-{product_id}"
+        price = min(max(math.exp(rng.gauss(math.log(60), 1.0)), 1.0), 2500.0)
+        products.append(
+            {
+                "id": product_id,
+                "name": name,
+                "description": f"{adjective} {noun.lower()} {rng.choice(FEATURES)} {rng.choice(FEATURES)}",
+                "price": math.floor(price) + 0.99,
+                "imageUrl": f"/images/products/{slug}.svg",
+                "category": category,
+                "stockQuantity": rng.randint(0, 500),
+                "sku": f"{prefix}-{counters[category]:06d}",
+                "slug": slug,
+            }
+        )
+    return products
+
+
+def write_catalog(
+    path: str | os.PathLike[str],
+    size: int,
+    categories: list[str] | None = None,
+    weights: list[float] | None = None,
+    seed: int = 0,
+) -> str:
+    """Generate a catalog and write it as a snapshot; returns the snapshot version."""
+    return write_snapshot(generate_products(size, categories, weights, seed), path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, required=True, help="number of products")
+    parser.add_argument("--categories", help='comma-separated "Name=weight" list (default: the real categories)')
+    parser.add_argument("--skew", type=float, default=0.0, help="Zipf exponent of the category distribution")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", required=True, help="snapshot path (.jsonl or .jsonl.gz)")
+    args = parser.parse_args()
+
+    categories, weights = parse_categories(args.categories, args.skew)
+    version = write_catalog(args.output, args.size, categories, weights, args.seed)
+    print(f"wrote {args.size} products to {args.output} (version {version})")
+
+
+if __name__ == "__main__":
+    main()
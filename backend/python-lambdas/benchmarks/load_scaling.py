@@ -0,0 +1,149 @@
+"""Local load test showing gunicorn throughput scaling with worker count.
+
+Starts ``gunicorn "shared.server:create_app('<service>')"`` with 1, 2, 4, ...
+workers (up to the number of CPU cores), drives it with closed-loop HTTP
+clients running in separate processes, and reports throughput and latency
+per worker count. Requires flask, flask-cors, gunicorn and
+python-json-logger (as installed in the Docker images).
+
+Usage:
+    python -m benchmarks.load_scaling [--service search] [--duration 10] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+LAMBDA_ROOT = Path(__file__).resolve().parent.parent
+
+REQUESTS = {
+    "search": ("GET", ["/api/search?q=pro", "/api/search?category=Electronics&sort=price_desc", "/api/search"], None),
+    "recommendations": ("GET", ["/api/recommendations?productId=3", "/api/recommendations?limit=20"], None),
+    "notifications": (
+        "POST",
+        ["/api/notifications/shipping-update"],
+        json.dumps({"orderId": "1", "customerEmail": "a@b.c", "trackingNumber": "T1", "status": "SHIPPED"}),
+    ),
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _client(args: tuple[int, str, float]) -> list[float]:
+    """Closed-loop client: one keep-alive connection, requests back to back until the deadline."""
+    port, service, deadline = args
+    method, paths, body = REQUESTS[service]
+    headers = {"Content-Type": "application/json"}
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    latencies = []
+    i = 0
+    while time.time() < deadline:
+        start = time.perf_counter()
+        conn.request(method, paths[i % len(paths)], body=body, headers=headers)
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        i += 1
+    conn.close()
+    return latencies
+
+
+def _wait_healthy(port: int, timeout: float = 30.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", "/health")
+            if conn.getresponse().status == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not become healthy")
+
+
+def run_level(service: str, workers: int, threads: int, clients: int, duration: float) -> dict[str, Any]:
+    """Benchmark one worker count."""
+    port = _free_port()
+    env = {
+        **os.environ,
+        "PORT": str(port),
+        "WEB_CONCURRENCY": str(workers),
+        "GUNICORN_THREADS": str(threads),
+        "CATALOG_RELOAD_INTERVAL": "0",
+        "PYTHONPATH": os.pathsep.join(filter(None, [str(LAMBDA_ROOT), os.environ.get("PYTHONPATH")])),
+    }
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", f"shared.server:create_app('{service}')"],
+        cwd=LAMBDA_ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        _wait_healthy(port)
+        deadline = time.time() + duration
+        with multiprocessing.Pool(clients) as pool:
+            per_client = pool.map(_client, [(port, service, deadline)] * clients)
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies = sorted(latency for client in per_client for latency in client)
+    return {
+        "service": service,
+        "workers": workers,
+        "threads": threads,
+        "clients": clients,
+        "requests": len(latencies),
+        "rps": len(latencies) / duration,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--service", choices=sorted(REQUESTS), default="search")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per worker count")
+    parser.add_argument("--threads", type=int, default=4, help="GUNICORN_THREADS per worker")
+    parser.add_argument("--clients", type=int, help="client processes (default: 2 per core)")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--json", action="store_true", help="emit machine-readable JSON")
+    args = parser.parse_args()
+
+    levels = []
+    workers = 1
+    while workers <= args.max_workers:
+        levels.append(workers)
+        workers *= 2
+    if levels[-1] != args.max_workers:
+        levels.append(args.max_workers)
+
+    clients = args.clients or 2 * (os.cpu_count() or 1)
+    results = [run_level(args.service, w, args.threads, clients, args.duration) for w in levels]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    base = results[0]["rps"]
+    print(f"{'workers':>7} {'req/s':>9} {'speedup':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for r in results:
+        print(f"{r['workers']:>7} {r['rps']:>9.0f} {r['rps'] / base:>8.2f} {r['p50_ms']:>8.2f} {r['p99_ms']:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
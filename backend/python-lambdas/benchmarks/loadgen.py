@@ -0,0 +1,405 @@
+"""Open-loop HTTP load generator for the containerized lambda runners.
+
+Replays a request trace against the search, recommendations and
+notifications services and reports latency percentiles corrected for
+coordinated omission: every request has an intended send time fixed by the
+arrival schedule, and its latency is measured from that time, not from when
+a free connection finally sent it. A stalled server therefore shows up as
+queueing delay in the percentiles instead of silently lowering the request
+rate. The uncorrected service time is reported next to it.
+
+Traces are JSON lines, one request each:
+
+    {"t": 0.0125, "service": "search", "method": "GET", "path": "/api/search?q=pro",
+     "headers": {"Accept-Encoding": "gzip"}, "body": null}
+
+``t`` (seconds from the start) is optional. Recorded traffic converted to
+this format replays as-is. ``synth`` writes synthetic traces from the same
+request mixes as benchmarks.bench_handlers: Poisson search and
+recommendation traffic plus periodic notification bursts.
+
+Schedules:
+    --rate R             open loop at R req/s (constant, or --arrival poisson),
+                         cycling through the trace
+    (no --rate)          the trace's own timestamps, scaled by --speed
+
+Targets are the docker-compose ports by default (localhost:3004-3006).
+``--in-process wsgi`` (Flask under wsgiref) or ``--in-process asgi``
+(Starlette under uvicorn) starts the services in this process on free
+ports instead. Nothing leaves the machine.
+
+Usage:
+    python -m benchmarks.loadgen synth -o trace.jsonl [--duration 60] [--rate 200] [--burst-every 10 --burst-size 50]
+    python -m benchmarks.loadgen run trace.jsonl [--rate 300 [--arrival poisson]] [--duration 30] [--connections 32]
+        [--target search=http://localhost:3004 ...] [--in-process wsgi|asgi] [--json]
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import logging
+import random
+import socket
+import sys
+import threading
+import time
+import urllib.parse
+from typing import Any, Iterator
+
+from benchmarks.bench_handlers import notification_events, recommendation_events, search_events
+from benchmarks.catalog_gen import CATEGORIES
+
+DEFAULT_TARGETS = {
+    "search": "http://localhost:3004",
+    "recommendations": "http://localhost:3005",
+    "notifications": "http://localhost:3006",
+}
+
+# Share of the steady (non-burst) traffic per service
+TRAFFIC_MIX = {"search": 0.6, "recommendations": 0.4}
+
+
+def _to_request(service: str, event: dict[str, Any]) -> dict[str, Any]:
+    """Convert an API Gateway event from the benchmark mixes into a trace request."""
+    query = urllib.parse.urlencode(event.get("queryStringParameters") or {})
+    return {
+        "service": service,
+        "method": event["httpMethod"],
+        "path": event["path"] + (f"?{query}" if query else ""),
+        "headers": {k: v for k, v in (event.get("headers") or {}).items() if k != "If-None-Match"},
+        "body": event.get("body"),
+    }
+
+
+def synthesize(
+    duration: float,
+    rate: float,
+    burst_every: float,
+    burst_size: int,
+    catalog_size: int,
+    seed: int,
+) -> list[dict[str, Any]]:
+    """Build a timestamped synthetic trace.
+
+    Args:
+        duration: Trace length in seconds.
+        rate: Mean rate of search + recommendation requests (Poisson arrivals).
+        burst_every: Seconds between notification bursts (0 disables them).
+        burst_size: Notifications per burst, sent back to back.
+        catalog_size: Highest product id for recommendation requests.
+        seed: Random seed.
+
+    Returns:
+        Requests sorted by ``t``.
+    """
+    rng = random.Random(seed)
+    steady = int(duration * rate * 1.2) + 1
+    pools = {
+        "search": iter(search_events(rng, steady, list(CATEGORIES))),
+        "recommendations": iter(recommendation_events(rng, steady, catalog_size)),
+    }
+    services, weights = zip(*TRAFFIC_MIX.items())
+    trace = []
+    t = rng.expovariate(rate)
+    while t < duration:
+        service = rng.choices(services, weights)[0]
+        trace.append({"t": round(t, 6), **_to_request(service, next(pools[service]))})
+        t += rng.expovariate(rate)
+    if burst_every > 0 and burst_size > 0:
+        bursts = int(duration // burst_every)
+        notifications = iter(notification_events(rng, bursts * burst_size))
+        for b in range(1, bursts + 1):
+            for _ in range(burst_size):
+                trace.append({"t": round(b * burst_every, 6), **_to_request("notifications", next(notifications))})
+    trace.sort(key=lambda r: r["t"])
+    return trace
+
+
+def load_trace(path: str) -> list[dict[str, Any]]:
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def schedule(
+    trace: list[dict[str, Any]],
+    rate: float | None,
+    arrival: str,
+    duration: float | None,
+    speed: float,
+    seed: int,
+) -> list[tuple[float, dict[str, Any]]]:
+    """Intended send offsets (seconds) for the run.
+
+    With a rate, requests cycle through the trace at that rate until the
+    duration (or one pass of the trace) is covered; without one, the trace
+    timestamps are replayed divided by speed.
+    """
+    if rate is None:
+        planned = [(r.get("t", 0.0) / speed, r) for r in trace]
+        return [p for p in planned if duration is None or p[0] < duration]
+    rng = random.Random(seed)
+    count = int(duration * rate) if duration else len(trace)
+    planned = []
+    t = 0.0
+    for i in range(count):
+        planned.append((t, trace[i % len(trace)]))
+        t += rng.expovariate(rate) if arrival == "poisson" else 1 / rate
+    return planned
+
+
+class _Worker(threading.Thread):
+    """One client connection per service; takes the next scheduled request and sends it on time."""
+
+    def __init__(self, runner: _Runner) -> None:
+        super().__init__(daemon=True)
+        self.runner = runner
+        self.results: list[tuple[str, int, float, float, float]] = []
+        self._connections: dict[str, http.client.HTTPConnection] = {}
+
+    def _connection(self, service: str) -> http.client.HTTPConnection:
+        conn = self._connections.get(service)
+        if conn is None:
+            url = urllib.parse.urlsplit(self.runner.targets[service])
+            conn = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=self.runner.timeout)
+            self._connections[service] = conn
+        return conn
+
+    def run(self) -> None:
+        runner = self.runner
+        for intended, request in runner.take():
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            service = request["service"]
+            sent = time.perf_counter()
+            status = 0
+            try:
+                conn = self._connection(service)
+                body = request.get("body")
+                conn.request(
+                    request["method"],
+                    request["path"],
+                    body=body.encode("utf-8") if body is not None else None,
+                    headers=request.get("headers") or {},
+                )
+                response = conn.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                broken = self._connections.pop(service, None)
+                if broken is not None:
+                    broken.close()
+            done = time.perf_counter()
+            self.results.append((service, status, intended, sent, done))
+        for conn in self._connections.values():
+            conn.close()
+
+
+class _Runner:
+    """Hands out (intended absolute time, request) pairs to the workers in schedule order."""
+
+    def __init__(self, planned: list[tuple[float, dict[str, Any]]], targets: dict[str, str], timeout: float) -> None:
+        self.planned = planned
+        self.targets = targets
+        self.timeout = timeout
+        self.start = 0.0
+        self._next = 0
+        self._lock = threading.Lock()
+
+    def take(self) -> Iterator[tuple[float, dict[str, Any]]]:
+        while True:
+            with self._lock:
+                index = self._next
+                self._next += 1
+            if index >= len(self.planned):
+                return
+            offset, request = self.planned[index]
+            yield self.start + offset, request
+
+
+def _percentiles(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {}
+    values = sorted(values)
+
+    def at(q: float) -> float:
+        return values[min(len(values) - 1, int(q * len(values)))] * 1000
+
+    return {"p50_ms": at(0.50), "p90_ms": at(0.90), "p99_ms": at(0.99), "p999_ms": at(0.999), "max_ms": values[-1] * 1000}
+
+
+def summarize(results: list[tuple[str, int, float, float, float]], start: float, warmup: float) -> dict[str, Any]:
+    """Per-service and overall report, excluding requests intended during the warm-up."""
+    measured = [r for r in results if r[2] - start >= warmup]
+    report: dict[str, Any] = {}
+    for service in sorted({r[0] for r in measured}) + ["all"]:
+        rows = [r for r in measured if service == "all" or r[0] == service]
+        if not rows:
+            continue
+        span = max(r[4] for r in rows) - min(r[2] for r in rows)
+        statuses: dict[str, int] = {}
+        for r in rows:
+            key = f"{r[1] // 100}xx" if r[1] else "error"
+            statuses[key] = statuses.get(key, 0) + 1
+        report[service] = {
+            "requests": len(rows),
+            "achieved_rps": len(rows) / span if span > 0 else None,
+            "statuses": statuses,
+            "latency": _percentiles([r[4] - r[2] for r in rows]),
+            "service_time": _percentiles([r[4] - r[3] for r in rows]),
+            "max_send_lag_ms": max(r[3] - r[2] for r in rows) * 1000,
+        }
+    return report
+
+
+def run_load(
+    planned: list[tuple[float, dict[str, Any]]],
+    targets: dict[str, str],
+    connections: int,
+    timeout: float,
+    warmup: float,
+) -> dict[str, Any]:
+    runner = _Runner(planned, targets, timeout)
+    workers = [_Worker(runner) for _ in range(connections)]
+    runner.start = time.perf_counter() + 0.1
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    results = [r for worker in workers for r in worker.results]
+    return summarize(results, runner.start, warmup)
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _wait_listening(port: int, timeout: float = 15.0) -> None:
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"in-process server on port {port} did not start")
+
+
+def start_in_process(kind: str, services: set[str]) -> dict[str, str]:
+    """Serve the services from this process on free ports; returns their base URLs."""
+    targets = {}
+    for service in sorted(services):
+        port = _free_port()
+        if kind == "wsgi":
+            from socketserver import ThreadingMixIn
+            from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+            from shared.server import after_fork, create_app
+
+            class QuietHandler(WSGIRequestHandler):
+                def log_message(self, *args: Any) -> None:
+                    pass
+
+            class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+                daemon_threads = True
+                request_queue_size = 128
+
+            app = create_app(service)
+            after_fork()
+            server: Any = make_server("127.0.0.1", port, app, ThreadingWSGIServer, QuietHandler)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+        else:
+            import uvicorn
+
+            from shared.asgi import create_asgi_app
+
+            config = uvicorn.Config(create_asgi_app(service), host="127.0.0.1", port=port, log_config=None, access_log=False)
+            threading.Thread(target=uvicorn.Server(config).run, daemon=True).start()
+        _wait_listening(port)
+        targets[service] = f"http://127.0.0.1:{port}"
+    # The services log every notification; keep the report readable
+    logging.root.setLevel(logging.WARNING)
+    return targets
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    synth = commands.add_parser("synth", help="write a synthetic trace")
+    synth.add_argument("-o", "--output", required=True)
+    synth.add_argument("--duration", type=float, default=60.0)
+    synth.add_argument("--rate", type=float, default=200.0, help="mean search + recommendation req/s")
+    synth.add_argument("--burst-every", type=float, default=10.0, help="seconds between notification bursts")
+    synth.add_argument("--burst-size", type=int, default=50)
+    synth.add_argument("--catalog-size", type=int, default=52, help="highest product id to request")
+    synth.add_argument("--seed", type=int, default=1)
+
+    run = commands.add_parser("run", help="replay a trace")
+    run.add_argument("trace")
+    run.add_argument("--rate", type=float, help="open-loop rate in req/s (default: trace timestamps)")
+    run.add_argument("--arrival", choices=("constant", "poisson"), default="constant")
+    run.add_argument("--speed", type=float, default=1.0, help="timestamp replay speed-up")
+    run.add_argument("--duration", type=float, help="seconds of schedule to run")
+    run.add_argument("--warmup", type=float, default=0.0, help="seconds excluded from the report")
+    run.add_argument("--connections", type=int, default=32)
+    run.add_argument("--timeout", type=float, default=10.0)
+    run.add_argument("--target", action="append", default=[], metavar="SERVICE=URL")
+    run.add_argument("--in-process", choices=("wsgi", "asgi"))
+    run.add_argument("--seed", type=int, default=1)
+    run.add_argument("--json", action="store_true", help="emit machine-readable JSON")
+    args = parser.parse_args()
+
+    if args.command == "synth":
+        trace = synthesize(args.duration, args.rate, args.burst_every, args.burst_size, args.catalog_size, args.seed)
+        with open(args.output, "w") as out:
+            for request in trace:
+                out.write(json.dumps(request) + "\n")
+        print(f"wrote {len(trace)} requests to {args.output}")
+        return
+
+    trace = load_trace(args.trace)
+    planned = schedule(trace, args.rate, args.arrival, args.duration, args.speed, args.seed)
+    services = {request["service"] for _, request in planned}
+    if args.in_process:
+        targets = start_in_process(args.in_process, services)
+    else:
+        targets = dict(DEFAULT_TARGETS)
+        for item in args.target:
+            service, _, url = item.partition("=")
+            targets[service] = url
+    missing = services - set(targets)
+    if missing:
+        sys.exit(f"no target for: {', '.join(sorted(missing))}")
+
+    report = {
+        "schedule": {
+            "requests": len(planned),
+            "seconds": planned[-1][0] if planned else 0.0,
+            "rate": args.rate,
+            "arrival": args.arrival if args.rate else "trace",
+            "connections": args.connections,
+        },
+        "targets": targets,
+        "results": run_load(planned, targets, args.connections, args.timeout, args.warmup),
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"{len(planned)} requests over {report['schedule']['seconds']:.1f}s, {args.connections} connections")
+    print(f"{'service':<16} {'req':>7} {'rps':>7} {'p50':>8} {'p99':>8} {'p99.9':>8} {'max':>8}  {'svc p99':>8}  statuses")
+    for service, r in report["results"].items():
+        lat, svc = r["latency"], r["service_time"]
+        print(
+            f"{service:<16} {r['requests']:>7} {r['achieved_rps'] or 0:>7.0f} {lat['p50_ms']:>8.2f} {lat['p99_ms']:>8.2f} "
+            f"{lat['p999_ms']:>8.2f} {lat['max_ms']:>8.2f}  {svc['p99_ms']:>8.2f}  {r['statuses']}"
+        )
+    print("latencies in ms from the intended send time (coordinated-omission corrected); svc = from actual send")
+
+
+if __name__ == "__main__":
+    main()
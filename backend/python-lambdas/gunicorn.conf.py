@@ -0,0 +1,37 @@
+"""Gunicorn settings for the Python Lambda container runners (see shared/server.py).
+
+Environment:
+    PORT               Listen port (default 8000).
+    WEB_CONCURRENCY    Worker processes (default: one per CPU core).
+    GUNICORN_THREADS   Threads per worker (default 4).
+    GUNICORN_TIMEOUT   Worker timeout in seconds (default 30).
+"""
+
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+threads = int(os.environ.get("GUNICORN_THREADS", "4"))
+worker_class = "gthread"
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", "30"))
+keepalive = 5
+
+# Build the app (and the catalog indexes) once in the master; workers share it copy-on-write
+preload_app = True
+
+accesslog = None
+errorlog = "-"
+
+
+def when_ready(server):
+    # Move everything loaded so far out of the GC's reach, so collections in the
+    # workers do not write to (and un-share) the preloaded catalog's pages.
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    from shared.server import after_fork
+
+    after_fork()
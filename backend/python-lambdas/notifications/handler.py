@@ -10,126 +10,153 @@ import json
 import logging
 from typing import Any
 
-from datadog_lambda.wrapper import datadog_lambda_wrapper
-from ddtrace import tracer
-
-from shared.utils import json_response, error_response
+from shared import metrics
+from shared.tracing import datadog_handler, trace_request
+from shared.utils import json_response, error_response, Router
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+SERVICE = "kelvo-ecomm-notifications"
+
+order_confirmation_stats = metrics.route("order-confirmation")
+shipping_update_stats = metrics.route("shipping-update")
+
 
 def _send_order_confirmation(body: dict[str, Any]) -> dict[str, Any]:
     """Simulate sending order confirmation email."""
-    with tracer.trace("notification.prepare", service="kelvo-ecomm-notifications"):
-        order_id = body.get("orderId")
-        customer_email = body.get("customerEmail")
-        customer_name = body.get("customerName")
-        items = body.get("items", [])
-        total_amount = body.get("totalAmount")
-
-        if not all([order_id, customer_email, customer_name, total_amount is not None]):
-            return error_response(
-                "Missing required fields: orderId, customerEmail, customerName, items, totalAmount",
-                status_code=400,
-                error_code="VALIDATION_ERROR",
+    with trace_request("notifications", SERVICE) as trace:
+        with trace.step("notification.prepare"):
+            order_id = body.get("orderId")
+            customer_email = body.get("customerEmail")
+            customer_name = body.get("customerName")
+            items = body.get("items", [])
+            total_amount = body.get("totalAmount")
+
+            if not all([order_id, customer_email, customer_name, total_amount is not None]):
+                return error_response(
+                    "Missing required fields: orderId, customerEmail, customerName, items, totalAmount",
+                    status_code=400,
+                    error_code="VALIDATION_ERROR",
+                )
+
+        with trace.step("notification.send"):
+            logger.info(
+                "Order confirmation email (simulated): orderId=%s to=%s items=%s total=%s",
+                order_id,
+                customer_email,
+                len(items),
+                total_amount,
+            )
+            return json_response(
+                {
+                    "success": True,
+                    "message": "Order confirmation sent",
+                    "orderId": order_id,
+                }
             )
-
-    with tracer.trace("notification.send", service="kelvo-ecomm-notifications"):
-        logger.info(
-            "Order confirmation email (simulated): orderId=%s to=%s items=%s total=%s",
-            order_id,
-            customer_email,
-            len(items),
-            total_amount,
-        )
-        return json_response(
-            {
-                "success": True,
-                "message": "Order confirmation sent",
-                "orderId": order_id,
-            }
-        )
 
 
 def _send_shipping_update(body: dict[str, Any]) -> dict[str, Any]:
     """Simulate sending shipping notification."""
-    with tracer.trace("notification.prepare", service="kelvo-ecomm-notifications"):
-        order_id = body.get("orderId")
-        customer_email = body.get("customerEmail")
-        tracking_number = body.get("trackingNumber")
-        status = body.get("status")
-
-        if not all([order_id, customer_email, tracking_number, status]):
-            return error_response(
-                "Missing required fields: orderId, customerEmail, trackingNumber, status",
-                status_code=400,
-                error_code="VALIDATION_ERROR",
+    with trace_request("notifications", SERVICE) as trace:
+        with trace.step("notification.prepare"):
+            order_id = body.get("orderId")
+            customer_email = body.get("customerEmail")
+            tracking_number = body.get("trackingNumber")
+            status = body.get("status")
+
+            if not all([order_id, customer_email, tracking_number, status]):
+                return error_response(
+                    "Missing required fields: orderId, customerEmail, trackingNumber, status",
+                    status_code=400,
+                    error_code="VALIDATION_ERROR",
+                )
+
+        with trace.step("notification.send"):
+            logger.info(
+                "Shipping update email (simulated): orderId=%s to=%s tracking=%s status=%s",
+                order_id,
+                customer_email,
+                tracking_number,
+                status,
+            )
+            return json_response(
+                {
+                    "success": True,
+                    "message": "Shipping update sent",
+                    "orderId": order_id,
+                }
             )
-
-    with tracer.trace("notification.send", service="kelvo-ecomm-notifications"):
-        logger.info(
-            "Shipping update email (simulated): orderId=%s to=%s tracking=%s status=%s",
-            order_id,
-            customer_email,
-            tracking_number,
-            status,
-        )
-        return json_response(
-            {
-                "success": True,
-                "message": "Shipping update sent",
-                "orderId": order_id,
-            }
-        )
 
 
 def _handle_health(event: dict[str, Any]) -> dict[str, Any]:
     """Handle health check."""
-    return json_response({"status": "healthy", "service": "kelvo-ecomm-notifications"})
-
-
-def _handle_options() -> dict[str, Any]:
-    """Handle CORS preflight OPTIONS request."""
-    return json_response({}, status_code=204)
+    return json_response({"status": "healthy", "service": SERVICE})
+
+
+def _json_body(event: dict[str, Any], stats: metrics.RouteMetrics) -> Any:
+    """Decode the request body, or return None if it is not valid JSON."""
+    with stats.timer("parse"):
+        try:
+            return json.loads(event.get("body") or "{}")
+        except json.JSONDecodeError:
+            return None
+
+
+def _handle_order_confirmation(event: dict[str, Any]) -> dict[str, Any]:
+    """Handle POST /api/notifications/order-confirmation request."""
+    body = _json_body(event, order_confirmation_stats)
+    if body is None:
+        return error_response("Invalid JSON body", status_code=400, error_code="INVALID_JSON")
+    return _send_order_confirmation(body)
+
+
+def _handle_shipping_update(event: dict[str, Any]) -> dict[str, Any]:
+    """Handle POST /api/notifications/shipping-update request."""
+    body = _json_body(event, shipping_update_stats)
+    if body is None:
+        return error_response("Invalid JSON body", status_code=400, error_code="INVALID_JSON")
+    return _send_shipping_update(body)
+
+
+router = Router()
+router.add("/health", _handle_health)
+router.add("/metrics", metrics.metrics_handler(SERVICE))
+router.add(
+    "/api/notifications/order-confirmation",
+    _handle_order_confirmation,
+    methods=("POST",),
+    middleware=(metrics.middleware("order-confirmation"),),
+)
+router.add(
+    "/api/notifications/shipping-update",
+    _handle_shipping_update,
+    methods=("POST",),
+    middleware=(metrics.middleware("shipping-update"),),
+)
+metrics.install_shutdown_flush(SERVICE)
 
 
 def _handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
-    """Main Lambda handler with routing."""
+    """Main Lambda handler: dispatches through the route table."""
     try:
-        path = event.get("rawPath") or event.get("path", "")
-        http_method = (event.get("requestContext", {}).get("http", {}).get("method") or event.get("httpMethod", "GET"))
-
-        if http_method == "OPTIONS":
-            return _handle_options()
-        if path.endswith("/health") or path == "/health":
-            return _handle_health(event)
-
-        if "order-confirmation" in path:
-            if http_method == "POST":
-                try:
-                    body = json.loads(event.get("body") or "{}")
-                except json.JSONDecodeError:
-                    return error_response("Invalid JSON body", status_code=400, error_code="INVALID_JSON")
-                return _send_order_confirmation(body)
-            return error_response("Method not allowed", status_code=405, error_code="METHOD_NOT_ALLOWED")
-
-        if "shipping-update" in path:
-            if http_method == "POST":
-                try:
-                    body = json.loads(event.get("body") or "{}")
-                except json.JSONDecodeError:
-                    return error_response("Invalid JSON body", status_code=400, error_code="INVALID_JSON")
-                return _send_shipping_update(body)
-            return error_response("Method not allowed", status_code=405, error_code="METHOD_NOT_ALLOWED")
-
-        return error_response("Not found", status_code=404, error_code="NOT_FOUND")
+        return router.dispatch(event)
     except Exception as e:
         logger.exception("Unhandled error in notifications handler")
         return error_response(str(e), status_code=500, error_code="INTERNAL_ERROR")
 
 
-@datadog_lambda_wrapper
+async def _handler_async(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    """Asyncio entry point.
+
+    Delivery is simulated (logged), so the request is handled directly on the
+    event loop; calls to a real email/SMS provider belong here as awaited I/O.
+    """
+    return _handler(event, context)
+
+
+@datadog_handler
 def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     """Datadog-instrumented Lambda entry point."""
     return _handler(event, context)
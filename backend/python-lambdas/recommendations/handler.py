@@ -8,47 +8,79 @@ GET /api/recommendations?productId={id}&limit=4
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any
 
-from datadog_lambda.wrapper import datadog_lambda_wrapper
-from ddtrace import tracer
-
-from shared.utils import json_response, error_response, PRODUCTS
+from shared import metrics
+from shared.singleflight import SingleFlight
+from shared.tracing import datadog_handler, trace_request
+from shared.utils import (
+    json_response,
+    error_response,
+    products_response,
+    compute_etag,
+    etag_matches,
+    not_modified_response,
+    Router,
+    compression_middleware,
+    cache_control_middleware,
+)
+from shared.catalog import Catalog, get_catalog
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+SERVICE = "kelvo-ecomm-recommendations"
+
+# Default Cache-Control for recommendations; override with CACHE_CONTROL_RECOMMENDATIONS
+DEFAULT_CACHE_CONTROL = "public, max-age=300"
+
+stats = metrics.route("recommendations")
 
-def _get_product_by_id(product_id: int) -> dict[str, Any] | None:
-    """Find a product by ID."""
-    for p in PRODUCTS:
-        if p["id"] == product_id:
-            return p
-    return None
+# Identical concurrent requests share one computation
+flights = SingleFlight("recommendations")
 
 
-def _get_recommendations_for_product(product_id: int, limit: int) -> list[dict[str, Any]]:
+def _get_recommendations_for_product(catalog: Catalog, product_id: int, limit: int) -> list[dict[str, Any]]:
     """Get similar products from the same category, excluding the given product."""
-    with tracer.trace("recommendations.calculate", service="kelvo-ecomm-recommendations"):
-        product = _get_product_by_id(product_id)
+    with trace_request("recommendations", SERVICE, "recommendations.calculate") as trace:
+        product = catalog.get(product_id)
         if not product:
             return []
 
         category = product["category"]
-        with tracer.trace("recommendations.filter", service="kelvo-ecomm-recommendations"):
-            same_category = [p for p in PRODUCTS if p["category"] == category and p["id"] != product_id]
-            return same_category[:limit]
+        with trace.step("recommendations.filter"):
+            same_category = []
+            for p in catalog.in_category(category):
+                if p["category"] == category and p["id"] != product_id:
+                    same_category.append(p)
+                    if len(same_category) == limit:
+                        break
+            return same_category
 
 
-def _get_featured_products(limit: int) -> list[dict[str, Any]]:
+def _get_featured_products(catalog: Catalog, limit: int) -> list[dict[str, Any]]:
     """Get top/featured products (first N by ID as featured)."""
-    with tracer.trace("recommendations.calculate", service="kelvo-ecomm-recommendations"):
-        with tracer.trace("recommendations.filter", service="kelvo-ecomm-recommendations"):
-            return PRODUCTS[:limit]
+    with trace_request("recommendations", SERVICE, "recommendations.calculate") as trace:
+        with trace.step("recommendations.filter"):
+            return list(catalog.products[:limit])
+
+
+def _recommendations_response(catalog: Catalog, product_id: int | None, limit: int) -> dict[str, Any]:
+    """Compute and serialize recommendations (without per-request headers)."""
+    with stats.timer("filter"):
+        if product_id is not None:
+            recommendations = _get_recommendations_for_product(catalog, product_id, limit)
+        else:
+            recommendations = _get_featured_products(catalog, limit)
+
+    with stats.timer("serialize"):
+        return products_response("recommendations", recommendations, fragments=catalog.fragments)
 
 
 def _handle_recommendations(event: dict[str, Any]) -> dict[str, Any]:
     """Handle GET /api/recommendations request."""
+    start = time.perf_counter()
     params = event.get("queryStringParameters") or {}
     product_id_str = params.get("productId")
     limit_str = params.get("limit", "4")
@@ -58,50 +90,64 @@ def _handle_recommendations(event: dict[str, Any]) -> dict[str, Any]:
     except ValueError:
         return error_response("Invalid limit parameter", status_code=400, error_code="INVALID_LIMIT")
 
+    product_id = None
     if product_id_str:
         try:
             product_id = int(product_id_str)
         except ValueError:
             return error_response("Invalid productId parameter", status_code=400, error_code="INVALID_PRODUCT_ID")
-        recommendations = _get_recommendations_for_product(product_id, limit)
-    else:
-        recommendations = _get_featured_products(limit)
+    stats.observe("parse", time.perf_counter() - start)
+
+    catalog = get_catalog()
+    etag = compute_etag("recommendations", params, catalog.generation)
+    cache_headers = {"ETag": etag}
+    if etag_matches(event, etag):
+        stats.increment("cache.hit")
+        return not_modified_response(cache_headers)
+    stats.increment("cache.miss")
 
-    return json_response({"recommendations": recommendations})
+    key = ("recommendations", product_id, limit, catalog.generation)
+    response = flights.do(key, lambda: _recommendations_response(catalog, product_id, limit))
+    return {**response, "headers": {**response["headers"], **cache_headers}}
 
 
 def _handle_health(event: dict[str, Any]) -> dict[str, Any]:
     """Handle health check."""
-    return json_response({"status": "healthy", "service": "kelvo-ecomm-recommendations"})
+    return json_response({"status": "healthy", "service": SERVICE})
 
 
-def _handle_options() -> dict[str, Any]:
-    """Handle CORS preflight OPTIONS request."""
-    return json_response({}, status_code=204)
+router = Router()
+router.add("/health", _handle_health)
+router.add("/metrics", metrics.metrics_handler(SERVICE))
+router.add(
+    "/api/recommendations",
+    _handle_recommendations,
+    middleware=(
+        metrics.middleware("recommendations"),
+        compression_middleware,
+        cache_control_middleware("recommendations", DEFAULT_CACHE_CONTROL),
+    ),
+)
+metrics.install_shutdown_flush(SERVICE)
 
 
 def _handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
-    """Main Lambda handler with routing."""
+    """Main Lambda handler: dispatches through the route table."""
     try:
-        path = event.get("rawPath") or event.get("path", "")
-        http_method = (event.get("requestContext", {}).get("http", {}).get("method") or event.get("httpMethod", "GET"))
-
-        if http_method == "OPTIONS":
-            return _handle_options()
-        if path.endswith("/health") or path == "/health":
-            return _handle_health(event)
-        if path.endswith("/recommendations") or "/api/recommendations" in path:
-            if http_method == "GET":
-                return _handle_recommendations(event)
-            return error_response("Method not allowed", status_code=405, error_code="METHOD_NOT_ALLOWED")
-
-        return error_response("Not found", status_code=404, error_code="NOT_FOUND")
+        return router.dispatch(event)
     except Exception as e:
         logger.exception("Unhandled error in recommendations handler")
         return error_response(str(e), status_code=500, error_code="INTERNAL_ERROR")
 
 
-@datadog_lambda_wrapper
+async def _handler_async(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    """Asyncio entry point: runs the CPU-bound handler on the shared executor."""
+    from shared.aio import run_blocking
+
+    return await run_blocking(_handler, event, context)
+
+
+@datadog_handler
 def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     """Datadog-instrumented Lambda entry point."""
     return _handler(event, context)
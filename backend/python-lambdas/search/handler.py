@@ -6,64 +6,94 @@ GET /api/search?q={query}&category={category}&minPrice={min}&maxPrice={max}&sort
 from __future__ import annotations
 
 import logging
+import time
 from typing import Any
 
-from datadog_lambda.wrapper import datadog_lambda_wrapper
-from ddtrace import tracer
-
-from shared.utils import json_response, error_response, PRODUCTS
+from shared import metrics
+from shared.singleflight import SingleFlight
+from shared.tracing import datadog_handler, trace_request
+from shared.utils import (
+    json_response,
+    error_response,
+    products_response,
+    compute_etag,
+    etag_matches,
+    not_modified_response,
+    Router,
+    compression_middleware,
+    cache_control_middleware,
+)
+from shared.catalog import Catalog, get_catalog
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+SERVICE = "kelvo-ecomm-search"
+
 SORT_OPTIONS = {"price_asc", "price_desc", "name"}
 
+stats = metrics.route("search")
+
+# Identical concurrent searches share one computation
+flights = SingleFlight("search")
+
+# Default Cache-Control for search results; override with CACHE_CONTROL_SEARCH
+DEFAULT_CACHE_CONTROL = "public, max-age=60"
+
 
 def _search_products(
+    catalog: Catalog,
     query: str | None,
     category: str | None,
     min_price: float | None,
     max_price: float | None,
     sort: str,
 ) -> list[dict[str, Any]]:
-    """Search products by name/description, filter by category and price, then sort."""
-    with tracer.trace("search.query", service="kelvo-ecomm-search"):
-        results = list(PRODUCTS)
-
-        if query:
-            q = query.lower()
-            with tracer.trace("search.filter", service="kelvo-ecomm-search"):
-                results = [
-                    p
-                    for p in results
-                    if q in p["name"].lower() or q in p["description"].lower()
-                ]
-
-        if category:
-            with tracer.trace("search.filter", service="kelvo-ecomm-search"):
-                results = [p for p in results if p["category"].lower() == category.lower()]
-
-        if min_price is not None:
-            with tracer.trace("search.filter", service="kelvo-ecomm-search"):
-                results = [p for p in results if p["price"] >= min_price]
-
-        if max_price is not None:
-            with tracer.trace("search.filter", service="kelvo-ecomm-search"):
-                results = [p for p in results if p["price"] <= max_price]
-
-        with tracer.trace("search.sort", service="kelvo-ecomm-search"):
-            if sort == "price_asc":
-                results.sort(key=lambda p: p["price"])
-            elif sort == "price_desc":
-                results.sort(key=lambda p: p["price"], reverse=True)
-            elif sort == "name":
-                results.sort(key=lambda p: p["name"].lower())
-
-        return results
+    """Search products by name/description and price within a presorted category listing."""
+    with trace_request("search", SERVICE, "search.query") as trace:
+        with trace.step("search.sort"), stats.timer("sort"):
+            results = catalog.ordered(sort, category)
+
+        with stats.timer("filter"):
+            if query:
+                q = query.lower()
+                search_text = catalog.search_text
+                with trace.step("search.filter"):
+                    results = [
+                        p
+                        for p in results
+                        if q in search_text[p["id"]][0] or q in search_text[p["id"]][1]
+                    ]
+
+            if min_price is not None:
+                with trace.step("search.filter"):
+                    results = [p for p in results if p["price"] >= min_price]
+
+            if max_price is not None:
+                with trace.step("search.filter"):
+                    results = [p for p in results if p["price"] <= max_price]
+
+        trace.count("search.results", len(results))
+        return list(results)
+
+
+def _search_response(
+    catalog: Catalog,
+    query: str | None,
+    category: str | None,
+    min_price: float | None,
+    max_price: float | None,
+    sort: str,
+) -> dict[str, Any]:
+    """Search and serialize the results (without per-request headers)."""
+    results = _search_products(catalog, query, category, min_price, max_price, sort)
+    with stats.timer("serialize"):
+        return products_response("products", results, {"count": len(results)}, fragments=catalog.fragments)
 
 
 def _handle_search(event: dict[str, Any]) -> dict[str, Any]:
     """Handle GET /api/search request."""
+    start = time.perf_counter()
     params = event.get("queryStringParameters") or {}
     query = params.get("q", "").strip() or None
     category = params.get("category", "").strip() or None
@@ -88,43 +118,59 @@ def _handle_search(event: dict[str, Any]) -> dict[str, Any]:
             max_price = float(params["maxPrice"])
         except ValueError:
             return error_response("Invalid maxPrice", status_code=400, error_code="INVALID_MAX_PRICE")
+    stats.observe("parse", time.perf_counter() - start)
+
+    catalog = get_catalog()
+    etag = compute_etag("search", params, catalog.generation)
+    cache_headers = {"ETag": etag}
+    if etag_matches(event, etag):
+        stats.increment("cache.hit")
+        return not_modified_response(cache_headers)
+    stats.increment("cache.miss")
 
-    results = _search_products(query, category, min_price, max_price, sort)
-    return json_response({"products": results, "count": len(results)})
+    # Matching is case-insensitive, so queries differing only in case share a result
+    key = ("search", query.lower() if query else None, category, min_price, max_price, sort, catalog.generation)
+    response = flights.do(key, lambda: _search_response(catalog, query, category, min_price, max_price, sort))
+    return {**response, "headers": {**response["headers"], **cache_headers}}
 
 
 def _handle_health(event: dict[str, Any]) -> dict[str, Any]:
     """Handle health check."""
-    return json_response({"status": "healthy", "service": "kelvo-ecomm-search"})
+    return json_response({"status": "healthy", "service": SERVICE})
 
 
-def _handle_options() -> dict[str, Any]:
-    """Handle CORS preflight OPTIONS request."""
-    return json_response({}, status_code=204)
+router = Router()
+router.add("/health", _handle_health)
+router.add("/metrics", metrics.metrics_handler(SERVICE))
+router.add(
+    "/api/search",
+    _handle_search,
+    middleware=(
+        metrics.middleware("search"),
+        compression_middleware,
+        cache_control_middleware("search", DEFAULT_CACHE_CONTROL),
+    ),
+)
+metrics.install_shutdown_flush(SERVICE)
 
 
 def _handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
-    """Main Lambda handler with routing."""
+    """Main Lambda handler: dispatches through the route table."""
     try:
-        path = event.get("rawPath") or event.get("path", "")
-        http_method = (event.get("requestContext", {}).get("http", {}).get("method") or event.get("httpMethod", "GET"))
-
-        if http_method == "OPTIONS":
-            return _handle_options()
-        if path.endswith("/health") or path == "/health":
-            return _handle_health(event)
-        if path.endswith("/search") or "/api/search" in path:
-            if http_method == "GET":
-                return _handle_search(event)
-            return error_response("Method not allowed", status_code=405, error_code="METHOD_NOT_ALLOWED")
-
-        return error_response("Not found", status_code=404, error_code="NOT_FOUND")
+        return router.dispatch(event)
     except Exception as e:
         logger.exception("Unhandled error in search handler")
         return error_response(str(e), status_code=500, error_code="INTERNAL_ERROR")
 
 
-@datadog_lambda_wrapper
+async def _handler_async(event: dict[str, Any], context: Any) -> dict[str, Any]:
+    """Asyncio entry point: runs the CPU-bound handler on the shared executor."""
+    from shared.aio import run_blocking
+
+    return await run_blocking(_handler, event, context)
+
+
+@datadog_handler
 def handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     """Datadog-instrumented Lambda entry point."""
     return _handler(event, context)
@@ -3,13 +3,45 @@
 from shared.utils import (
     json_response,
     error_response,
+    products_response,
+    encode_json,
+    set_json_backend,
+    get_json_backend,
     get_trace_context,
-    PRODUCTS,
+    get_header,
+    compute_etag,
+    etag_matches,
+    cache_control_for,
+    not_modified_response,
+    compress_response,
+    negotiate_encoding,
+    ProductFragmentCache,
+    Router,
+    compression_middleware,
+    cache_control_middleware,
+    request_method,
+    request_path,
 )
 
 __all__ = [
     "json_response",
     "error_response",
+    "products_response",
+    "encode_json",
+    "set_json_backend",
+    "get_json_backend",
     "get_trace_context",
-    "PRODUCTS",
+    "get_header",
+    "compute_etag",
+    "etag_matches",
+    "cache_control_for",
+    "not_modified_response",
+    "compress_response",
+    "negotiate_encoding",
+    "ProductFragmentCache",
+    "Router",
+    "compression_middleware",
+    "cache_control_middleware",
+    "request_method",
+    "request_path",
 ]
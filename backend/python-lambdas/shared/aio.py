@@ -0,0 +1,60 @@
+"""Executor offloading for the async handler entry points.
+
+Async handlers run on the event loop and must not block it. CPU-bound work
+(search filtering, serialization) is handed to a shared pool with
+run_blocking(); while it runs, the loop keeps serving other requests, so a
+single container can hold thousands of slow requests open without a thread
+per request.
+
+The pool is a thread pool in the serving process, so handlers share that
+process's catalog, reloader and metrics. To use more cores, run more
+uvicorn workers (WEB_CONCURRENCY) rather than a process pool.
+
+Environment:
+    ASYNC_EXECUTOR_WORKERS   Pool size (default: concurrent.futures' default).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import concurrent.futures
+import contextvars
+import functools
+import os
+import threading
+from typing import Any, Callable, TypeVar
+
+T = TypeVar("T")
+
+_executor: concurrent.futures.Executor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> concurrent.futures.Executor:
+    """Return the shared pool for blocking work, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                workers = int(os.environ.get("ASYNC_EXECUTOR_WORKERS", "0")) or None
+                _executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers, thread_name_prefix="handler")
+    return _executor
+
+
+async def run_blocking(func: Callable[..., T], *args: Any) -> T:
+    """Run func(*args) on the shared pool and await its result.
+
+    The caller's contextvars (e.g. the active trace) are carried over.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(get_executor(), functools.partial(context.run, func, *args))
+
+
+def shutdown_executor() -> None:
+    """Stop the shared pool, waiting for queued work to finish."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
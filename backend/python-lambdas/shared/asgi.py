@@ -0,0 +1,120 @@
+"""Asyncio runner (Starlette + uvicorn) for the async handler entry points.
+
+Serves the same services as shared.server, but calls each handler module's
+``_handler_async``, so slow requests wait on the event loop instead of
+occupying a worker thread. Run it with::
+
+    SERVICE=notifications python -m shared.asgi
+
+Environment:
+    SERVICE            Key of shared.server.SERVICES.
+    PORT               Listen port (default: the service's port).
+    WEB_CONCURRENCY    uvicorn worker processes (default 1).
+"""
+
+from __future__ import annotations
+
+import base64
+import contextlib
+import importlib
+import os
+import re
+from typing import Any
+
+from shared.server import SERVICES, configure_logging
+
+
+def _starlette_path(rule: str) -> str:
+    """Convert a Flask rule (``<path:subpath>``) to a Starlette path (``{subpath:path}``)."""
+    return re.sub(r"<(?:(\w+):)?(\w+)>", lambda m: "{%s%s}" % (m.group(2), ":path" if m.group(1) == "path" else ""), rule)
+
+
+async def make_event(request: Any) -> dict[str, Any]:
+    """Translate a Starlette request into an API Gateway proxy event."""
+    body = await request.body()
+    return {
+        "httpMethod": request.method,
+        "path": request.url.path,
+        "queryStringParameters": dict(request.query_params),
+        "body": body.decode("utf-8") if body else None,
+        "headers": dict(request.headers),
+    }
+
+
+def to_starlette_response(result: dict[str, Any]) -> Any:
+    """Translate an API Gateway response dict into a Starlette response."""
+    from starlette.responses import Response
+
+    body = result["body"]
+    if result.get("isBase64Encoded"):
+        body = base64.b64decode(body)
+    return Response(
+        body, status_code=result["statusCode"], headers=result.get("headers", {}), media_type="application/json"
+    )
+
+
+def create_asgi_app(service: str) -> Any:
+    """Build the Starlette app serving one Lambda service through its ``_handler_async``.
+
+    Args:
+        service: Key of shared.server.SERVICES.
+
+    Returns:
+        ASGI application.
+    """
+    from starlette.applications import Starlette
+    from starlette.middleware import Middleware
+    from starlette.middleware.cors import CORSMiddleware
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    spec = SERVICES[service]
+    configure_logging(spec.name)
+    handler = importlib.import_module(spec.handler_module)._handler_async
+    if spec.uses_catalog:
+        from shared.catalog import start_catalog_reloader
+
+        start_catalog_reloader()
+
+    async def invoke(request: Any) -> Any:
+        return to_starlette_response(await handler(await make_event(request), {}))
+
+    async def health(request: Any) -> Any:
+        return JSONResponse({"status": "healthy", "service": spec.name})
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: Any) -> Any:
+        yield
+        from shared.aio import shutdown_executor
+
+        shutdown_executor()
+
+    routes = [Route(_starlette_path(rule), invoke, methods=list(methods)) for rule, methods in spec.routes]
+    routes.append(Route("/health", health, methods=["GET"]))
+    middleware = [Middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])]
+    return Starlette(routes=routes, middleware=middleware, lifespan=lifespan)
+
+
+def app_from_env() -> Any:
+    """uvicorn factory: the app for the service named by the SERVICE env var."""
+    return create_asgi_app(os.environ["SERVICE"])
+
+
+def main() -> None:
+    import uvicorn
+
+    service = os.environ.get("SERVICE", "")
+    if service not in SERVICES:
+        raise SystemExit(f"SERVICE must be one of: {', '.join(SERVICES)}")
+    uvicorn.run(
+        "shared.asgi:app_from_env",
+        factory=True,
+        host="0.0.0.0",
+        port=int(os.environ.get("PORT", SERVICES[service].port)),
+        workers=int(os.environ.get("WEB_CONCURRENCY", "1")),
+        log_config=None,
+    )
+
+
+if __name__ == "__main__":
+    main()
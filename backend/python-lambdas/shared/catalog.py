@@ -0,0 +1,658 @@
+"""Product catalog loading for Kelvo E-Comm Python Lambda functions.
+
+The catalog is read from a versioned JSON-lines snapshot exported from the
+Java order service's ``products`` table. The first line is a header::
+
+    {"format": 1, "version": "...", "count": 52}
+
+followed by one product object per line. The snapshot is parsed as a stream
+and all lookup indexes are built during that single pass, so handlers never
+scan the product list to find a product or a category.
+
+Export and build a snapshot from the order service database::
+
+    psql "$DATABASE_URL" -c "\\copy (SELECT row_to_json(p) FROM products p ORDER BY id) TO 'products.jsonl'"
+    python -m shared.catalog build products.jsonl shared/catalog.jsonl
+
+Report load time and memory of a snapshot::
+
+    python -m shared.catalog stats shared/catalog.jsonl
+
+At build time the fully indexed catalog is also compiled into an artifact
+(``shared/catalog.pkl``) that get_catalog() loads with a single read and
+unpickle instead of parsing and indexing the snapshot::
+
+    python -m shared.catalog compile
+
+The artifact is only used if its format, snapshot version, size and CRC32
+match the snapshot being served; otherwise the indexes are built from the
+snapshot.
+It is trusted build output packaged with the code, never user input.
+
+Long-running container runners call start_catalog_reloader(), which polls
+the snapshot every CATALOG_RELOAD_INTERVAL seconds (default 30, 0 disables)
+and swaps in a freshly built Catalog when its version changes. A Catalog is
+never modified after construction, so a request that fetched one with
+get_catalog() keeps a consistent view even if a reload lands mid-request.
+"""
+
+from __future__ import annotations
+
+import gc
+import gzip
+import json
+import logging
+import os
+import pickle
+import threading
+import time
+import zlib
+from typing import IO, Any, Callable, Iterator, NamedTuple
+
+from shared.utils import ProductFragmentCache, encode_json, get_json_backend
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FORMAT = 1
+
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog.jsonl")
+
+DEFAULT_ARTIFACT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog.pkl")
+
+# Precompiled artifact layout: magic line, JSON header line, pickle (protocol 5) of the Catalog.
+# Bump ARTIFACT_FORMAT whenever Catalog or ProductFragmentCache change shape.
+ARTIFACT_MAGIC = b"KELVO-CATALOG\n"
+ARTIFACT_FORMAT = 2
+
+# Products loaded between GIL releases during a background reload
+RELOAD_YIELD_EVERY = 500
+
+# Product fields served to clients, in response order
+PRODUCT_FIELDS = ("id", "name", "description", "price", "imageUrl", "category", "stockQuantity", "sku", "slug")
+
+# Sort orders precomputed at load time (see Catalog.ordered)
+SORT_KEYS = {
+    "name": (lambda p: p["name"].lower(), False),
+    "price_asc": (lambda p: p["price"], False),
+    "price_desc": (lambda p: p["price"], True),
+}
+
+
+class CatalogError(Exception):
+    """Raised when a catalog snapshot is missing or malformed."""
+
+
+class CatalogStats(NamedTuple):
+    """Load metrics reported for a catalog snapshot."""
+
+    product_count: int
+    snapshot_bytes: int
+    load_seconds: float
+    peak_memory_bytes: int | None = None
+
+
+class Catalog(NamedTuple):
+    """Immutable product catalog with its lookup indexes.
+
+    Attributes:
+        version: Snapshot version from the header line.
+        generation: Content digest of the catalog, used in ETags.
+        products: All products in snapshot order.
+        by_id: Product ID -> product.
+        by_category: Lowercased category -> products in snapshot order.
+        search_text: Product ID -> (lowercased name, lowercased description).
+        orderings: Sort option -> lowercased category (or None for all) -> products in that order.
+        fragments: Pre-encoded JSON fragment of every product.
+        stats: Load metrics.
+    """
+
+    version: str
+    generation: str
+    products: tuple[dict[str, Any], ...]
+    by_id: dict[int, dict[str, Any]]
+    by_category: dict[str, tuple[dict[str, Any], ...]]
+    search_text: dict[int, tuple[str, str]]
+    orderings: dict[str, dict[str | None, tuple[dict[str, Any], ...]]]
+    fragments: ProductFragmentCache
+    stats: CatalogStats
+
+    def get(self, product_id: int) -> dict[str, Any] | None:
+        """Find a product by ID."""
+        return self.by_id.get(product_id)
+
+    def in_category(self, category: str) -> tuple[dict[str, Any], ...]:
+        """Products of a category (case-insensitive), in snapshot order."""
+        return self.by_category.get(category.lower(), ())
+
+    def ordered(self, sort: str, category: str | None = None) -> tuple[dict[str, Any], ...]:
+        """Products sorted by one of SORT_KEYS, optionally restricted to a category."""
+        by_category = self.orderings[sort]
+        return by_category.get(category.lower() if category else None, ())
+
+
+def _json_loads() -> Callable[[bytes], Any]:
+    """JSON decoder for snapshot lines, imported on first load rather than at module import."""
+    try:
+        from orjson import loads
+    except ImportError:
+        from json import loads
+    return loads
+
+
+def _open_snapshot(path: str) -> IO[bytes]:
+    if path.endswith(".gz"):
+        return gzip.open(path, "rb")
+    return open(path, "rb")
+
+
+def _read_header(stream: IO[bytes], path: str) -> dict[str, Any]:
+    line = stream.readline()
+    try:
+        header = _json_loads()(line)
+    except ValueError as e:
+        raise CatalogError(f"{path}: invalid header line: {e}") from e
+    if not isinstance(header, dict) or header.get("format") != CATALOG_FORMAT:
+        raise CatalogError(f"{path}: unsupported snapshot format {header!r}")
+    return header
+
+
+def read_snapshot_version(path: str | os.PathLike[str]) -> str:
+    """Read only the header of a snapshot and return its version."""
+    path = os.fspath(path)
+    with _open_snapshot(path) as stream:
+        return str(_read_header(stream, path).get("version", ""))
+
+
+def _read_products(path: str, yield_every: int = 0) -> tuple[
+    dict[str, Any],
+    list[dict[str, Any]],
+    dict[int, dict[str, Any]],
+    dict[str, tuple[dict[str, Any], ...]],
+    dict[int, tuple[str, str]],
+    int,
+]:
+    """Stream a snapshot, building the ID, category and search-text indexes as lines are parsed.
+
+    With yield_every > 0, the GIL is released every that many lines so
+    request threads are not starved by a background reload.
+    """
+    products: list[dict[str, Any]] = []
+    by_id: dict[int, dict[str, Any]] = {}
+    by_category: dict[str, list[dict[str, Any]]] = {}
+    search_text: dict[int, tuple[str, str]] = {}
+    loads = _json_loads()
+    try:
+        with _open_snapshot(path) as stream:
+            header = _read_header(stream, path)
+            for line_number, line in enumerate(stream, start=2):
+                if not line.strip():
+                    continue
+                try:
+                    product = loads(line)
+                    product_id = product["id"]
+                    category = product["category"]
+                    text = (product["name"].lower(), product["description"].lower())
+                except (ValueError, KeyError, TypeError, AttributeError) as e:
+                    raise CatalogError(f"{path}:{line_number}: invalid product: {e}") from e
+                if product_id in by_id:
+                    raise CatalogError(f"{path}:{line_number}: duplicate product id {product_id}")
+                products.append(product)
+                by_id[product_id] = product
+                by_category.setdefault(category.lower(), []).append(product)
+                search_text[product_id] = text
+                if yield_every and len(products) % yield_every == 0:
+                    time.sleep(0)
+            snapshot_bytes = stream.tell()
+    except OSError as e:
+        raise CatalogError(f"Cannot read catalog snapshot {path}: {e}") from e
+
+    if "count" in header and header["count"] != len(products):
+        raise CatalogError(f"{path}: header count {header['count']} != {len(products)} products")
+    categories = {category: tuple(group) for category, group in by_category.items()}
+    return header, products, by_id, categories, search_text, snapshot_bytes
+
+
+def load_catalog(
+    path: str | os.PathLike[str] | None = None,
+    measure_memory: bool = False,
+    previous: Catalog | None = None,
+    yield_every: int = 0,
+) -> Catalog:
+    """Stream a snapshot and build the catalog and its indexes in one pass.
+
+    Args:
+        path: Snapshot path; defaults to snapshot_path().
+        measure_memory: Record peak allocation with tracemalloc (slows loading).
+        previous: Catalog being replaced; unchanged product fragments are reused.
+        yield_every: Release the GIL every N products (for background reloads).
+
+    Returns:
+        The loaded Catalog.
+
+    Raises:
+        CatalogError: If the snapshot is missing or malformed.
+    """
+    path = os.fspath(path) if path is not None else snapshot_path()
+    if measure_memory:
+        import tracemalloc
+
+        # Resolve the lazily imported JSON codecs first so their import is not measured
+        _json_loads()
+        get_json_backend()
+    tracing = measure_memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    peak = None
+    started = time.perf_counter()
+    try:
+        header, products, by_id, by_category, search_text, snapshot_bytes = _read_products(path, yield_every)
+
+        orderings: dict[str, dict[str | None, tuple[dict[str, Any], ...]]] = {}
+        for sort, (key, reverse) in SORT_KEYS.items():
+            ordered = sorted(products, key=key, reverse=reverse)
+            grouped: dict[str | None, list[dict[str, Any]]] = {None: ordered}
+            for product in ordered:
+                grouped.setdefault(product["category"].lower(), []).append(product)
+            orderings[sort] = {category: tuple(group) for category, group in grouped.items()}
+
+        if previous is not None:
+            fragments = previous.fragments.rebuilt(products)
+        else:
+            fragments = ProductFragmentCache(products)
+    finally:
+        if tracing:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    stats = CatalogStats(
+        product_count=len(products),
+        snapshot_bytes=snapshot_bytes,
+        load_seconds=time.perf_counter() - started,
+        peak_memory_bytes=peak,
+    )
+    catalog = Catalog(
+        version=str(header.get("version", "")),
+        generation=fragments.digest,
+        products=tuple(products),
+        by_id=by_id,
+        by_category=by_category,
+        search_text=search_text,
+        orderings=orderings,
+        fragments=fragments,
+        stats=stats,
+    )
+    logger.info(
+        "Loaded catalog %s: version=%s products=%d bytes=%d load_ms=%.1f peak_memory_bytes=%s",
+        path,
+        catalog.version,
+        stats.product_count,
+        stats.snapshot_bytes,
+        stats.load_seconds * 1000,
+        stats.peak_memory_bytes,
+    )
+    return catalog
+
+
+def snapshot_path() -> str:
+    """Snapshot location: the CATALOG_SNAPSHOT_PATH env var, else the packaged catalog.jsonl."""
+    return os.environ.get("CATALOG_SNAPSHOT_PATH") or DEFAULT_SNAPSHOT_PATH
+
+
+def artifact_path() -> str:
+    """Artifact location: the CATALOG_ARTIFACT_PATH env var, else the packaged catalog.pkl."""
+    return os.environ.get("CATALOG_ARTIFACT_PATH") or DEFAULT_ARTIFACT_PATH
+
+
+def _snapshot_fingerprint(path: str | os.PathLike[str]) -> dict[str, Any]:
+    """Size and CRC32 of a snapshot file, identifying its content regardless of its version string."""
+    crc = 0
+    size = 0
+    with open(path, "rb") as stream:
+        while chunk := stream.read(1 << 20):
+            crc = zlib.crc32(chunk, crc)
+            size += len(chunk)
+    return {"snapshotBytes": size, "snapshotCrc": f"{crc:08x}"}
+
+
+def compile_catalog(
+    snapshot: str | os.PathLike[str] | None = None,
+    artifact: str | os.PathLike[str] | None = None,
+) -> Catalog:
+    """Build the catalog from a snapshot and write it as a precompiled artifact.
+
+    Args:
+        snapshot: Snapshot path; defaults to snapshot_path().
+        artifact: Artifact path; defaults to artifact_path(). Replaced atomically.
+
+    Returns:
+        The compiled Catalog.
+    """
+    snapshot = os.fspath(snapshot) if snapshot is not None else snapshot_path()
+    catalog = load_catalog(snapshot)
+    header = {
+        "format": ARTIFACT_FORMAT,
+        "snapshotVersion": catalog.version,
+        "generation": catalog.generation,
+        **_snapshot_fingerprint(snapshot),
+    }
+    artifact = os.fspath(artifact) if artifact is not None else artifact_path()
+    directory, name = os.path.split(artifact)
+    tmp_path = os.path.join(directory, f".{name}.tmp")
+    with open(tmp_path, "wb") as out:
+        out.write(ARTIFACT_MAGIC)
+        out.write(encode_json(header) + b"\n")
+        pickle.dump(catalog, out, protocol=5)
+    os.replace(tmp_path, artifact)
+    return catalog
+
+
+def load_catalog_artifact(path: str | os.PathLike[str], snapshot: str | os.PathLike[str]) -> Catalog:
+    """Load a precompiled catalog artifact with one read.
+
+    Args:
+        path: Artifact path.
+        snapshot: Path of the snapshot being served; the artifact must have
+            been compiled from it. Besides the version, its size and CRC32
+            are compared, since ``build --version`` can give different
+            content the same version.
+
+    Returns:
+        The Catalog, with stats describing this load.
+
+    Raises:
+        FileNotFoundError: If there is no artifact.
+        CatalogError: If the artifact is malformed or its format or snapshot
+            does not match.
+    """
+    started = time.perf_counter()
+    with open(path, "rb") as artifact:
+        data = artifact.read()
+    if not data.startswith(ARTIFACT_MAGIC):
+        raise CatalogError(f"{path}: not a catalog artifact")
+    header_end = data.find(b"\n", len(ARTIFACT_MAGIC))
+    try:
+        header = json.loads(data[len(ARTIFACT_MAGIC) : header_end])
+    except ValueError as e:
+        raise CatalogError(f"{path}: invalid artifact header: {e}") from e
+    if header.get("format") != ARTIFACT_FORMAT:
+        raise CatalogError(f"{path}: artifact format {header.get('format')} != {ARTIFACT_FORMAT}")
+    snapshot_version = read_snapshot_version(snapshot)
+    if header.get("snapshotVersion") != snapshot_version:
+        raise CatalogError(f"{path}: compiled from version {header.get('snapshotVersion')}, snapshot is {snapshot_version}")
+    fingerprint = _snapshot_fingerprint(snapshot)
+    if any(header.get(key) != value for key, value in fingerprint.items()):
+        raise CatalogError(
+            f"{path}: compiled from a different snapshot with version {snapshot_version} "
+            f"({header.get('snapshotBytes')} bytes, crc {header.get('snapshotCrc')}; "
+            f"snapshot has {fingerprint['snapshotBytes']} bytes, crc {fingerprint['snapshotCrc']})"
+        )
+    # Unpickling allocates one container per product field; cyclic GC passes
+    # over that many new objects would otherwise dominate the load time.
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        catalog = pickle.loads(memoryview(data)[header_end + 1 :])
+    except Exception as e:
+        raise CatalogError(f"{path}: cannot unpickle artifact: {e}") from e
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    if not isinstance(catalog, Catalog):
+        raise CatalogError(f"{path}: artifact does not contain a Catalog")
+
+    stats = CatalogStats(
+        product_count=len(catalog.products),
+        snapshot_bytes=len(data),
+        load_seconds=time.perf_counter() - started,
+    )
+    logger.info(
+        "Loaded catalog artifact %s: version=%s products=%d bytes=%d load_ms=%.1f",
+        path,
+        catalog.version,
+        stats.product_count,
+        stats.snapshot_bytes,
+        stats.load_seconds * 1000,
+    )
+    return catalog._replace(stats=stats)
+
+
+def _load_initial_catalog() -> Catalog:
+    """Load the precompiled artifact if it matches the snapshot, else build from the snapshot."""
+    snapshot = snapshot_path()
+    try:
+        return load_catalog_artifact(artifact_path(), snapshot)
+    except FileNotFoundError:
+        logger.info("No catalog artifact at %s; building indexes from %s", artifact_path(), snapshot)
+    except (CatalogError, OSError) as e:
+        logger.warning("Ignoring catalog artifact: %s", e)
+    return load_catalog(snapshot)
+
+
+_catalog: Catalog | None = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> Catalog:
+    """Return the active catalog, loading it on first use."""
+    global _catalog
+    catalog = _catalog
+    if catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                _catalog = _load_initial_catalog()
+            catalog = _catalog
+    return catalog
+
+
+def set_catalog(catalog: Catalog) -> None:
+    """Install catalog as the active catalog.
+
+    This is a single reference assignment, so concurrent readers see either
+    the old or the new catalog, never a mix of the two.
+    """
+    global _catalog
+    _catalog = catalog
+
+
+def reload_catalog(force: bool = False, yield_every: int = 0) -> bool:
+    """Rebuild the active catalog if the snapshot version changed.
+
+    The new catalog and its indexes are fully built before being installed
+    with set_catalog(); on failure the current catalog stays in service.
+
+    Args:
+        force: Reload even if the snapshot version is unchanged.
+        yield_every: Release the GIL every N products while loading.
+
+    Returns:
+        True if a new catalog was installed.
+
+    Raises:
+        CatalogError: If the new snapshot cannot be loaded.
+    """
+    current = get_catalog()
+    path = snapshot_path()
+    try:
+        version = read_snapshot_version(path)
+    except OSError as e:
+        raise CatalogError(f"Cannot read catalog snapshot {path}: {e}") from e
+    if not force and version == current.version:
+        return False
+    catalog = load_catalog(path, previous=current, yield_every=yield_every)
+    set_catalog(catalog)
+    logger.info(
+        "Catalog reloaded: version %s -> %s, %d of %d product fragments re-encoded",
+        current.version,
+        catalog.version,
+        catalog.fragments.encoded,
+        catalog.stats.product_count,
+    )
+    return True
+
+
+class CatalogReloader(threading.Thread):
+    """Daemon thread that polls the snapshot and reloads the catalog off the request path."""
+
+    def __init__(self, interval: float) -> None:
+        super().__init__(name="catalog-reloader", daemon=True)
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._last_stat: tuple[int, int] | None = None
+
+    def _snapshot_changed(self) -> bool:
+        """Cheap stat()-based check so the header is only read after the file changes."""
+        try:
+            st = os.stat(snapshot_path())
+        except OSError:
+            return False
+        stat = (st.st_mtime_ns, st.st_size)
+        changed = self._last_stat is not None and stat != self._last_stat
+        self._last_stat = stat
+        return changed
+
+    def _reload(self) -> None:
+        try:
+            reload_catalog(yield_every=RELOAD_YIELD_EVERY)
+        except CatalogError:
+            logger.exception("Catalog reload failed; keeping version %s", get_catalog().version)
+
+    def run(self) -> None:
+        # Record the stat baseline, then compare versions once: the catalog in
+        # memory may predate the current snapshot (e.g. a gunicorn worker
+        # respawned from the preloaded master after the snapshot changed)
+        self._snapshot_changed()
+        self._reload()
+        while not self._stopped.wait(self.interval):
+            if self._snapshot_changed():
+                self._reload()
+
+    def stop(self) -> None:
+        """Stop polling after the current iteration."""
+        self._stopped.set()
+
+
+def start_catalog_reloader(interval: float | None = None) -> CatalogReloader | None:
+    """Load the catalog and start polling its snapshot for new versions.
+
+    Args:
+        interval: Poll interval in seconds; defaults to CATALOG_RELOAD_INTERVAL
+            (30). Zero or less disables reloading.
+
+    Returns:
+        The started reloader thread, or None if reloading is disabled.
+    """
+    get_catalog()
+    if interval is None:
+        interval = float(os.environ.get("CATALOG_RELOAD_INTERVAL", 30))
+    if interval <= 0:
+        return None
+    reloader = CatalogReloader(interval)
+    reloader.start()
+    return reloader
+
+
+def _camel_case(name: str) -> str:
+    head, *rest = name.split("_")
+    return head + "".join(part.title() for part in rest)
+
+
+def normalize_product(row: dict[str, Any]) -> dict[str, Any]:
+    """Convert an exported ``products`` row to the served product schema.
+
+    Accepts snake_case column names (``image_url``) as produced by
+    ``row_to_json`` and drops columns that are not in PRODUCT_FIELDS.
+    """
+    row = {_camel_case(key): value for key, value in row.items()}
+    missing = [field for field in PRODUCT_FIELDS if field not in row]
+    if missing:
+        raise CatalogError(f"Product {row.get('id')!r} is missing fields: {', '.join(missing)}")
+    product = {field: row[field] for field in PRODUCT_FIELDS}
+    product["id"] = int(product["id"])
+    product["price"] = float(product["price"])
+    product["stockQuantity"] = int(product["stockQuantity"])
+    return product
+
+
+def iter_rows(path: str | os.PathLike[str]) -> Iterator[dict[str, Any]]:
+    """Stream product rows from a JSON-lines export, skipping a snapshot header if present."""
+    path = os.fspath(path)
+    loads = _json_loads()
+    with _open_snapshot(path) as stream:
+        for line in stream:
+            if line.strip():
+                row = loads(line)
+                if "format" not in row:
+                    yield row
+
+
+def write_snapshot(
+    products: list[dict[str, Any]],
+    path: str | os.PathLike[str],
+    version: str | None = None,
+) -> str:
+    """Write products as a versioned JSON-lines snapshot.
+
+    Args:
+        products: Products in the served schema.
+        path: Output path (gzip-compressed if it ends in .gz). Replaced
+            atomically.
+        version: Snapshot version; defaults to a digest of the content.
+
+    Returns:
+        The snapshot version written.
+    """
+    lines = [encode_json(product) + b"\n" for product in products]
+    if version is None:
+        crc = 0
+        for line in lines:
+            crc = zlib.crc32(line, crc)
+        version = f"{crc:08x}"
+    header = {"format": CATALOG_FORMAT, "version": version, "count": len(products)}
+    path = os.fspath(path)
+    opener = gzip.open if path.endswith(".gz") else open
+    # Write next to the target and rename, so a reloader never reads a partial file
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".{name}.tmp")
+    with opener(tmp_path, "wb") as out:
+        out.write(encode_json(header) + b"\n")
+        out.writelines(lines)
+    os.replace(tmp_path, path)
+    return version
+
+
+def main() -> None:
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build and inspect catalog snapshots.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    build = commands.add_parser("build", help="build a snapshot from a products table export")
+    build.add_argument("source", help="JSON-lines export, one products row per line")
+    build.add_argument("output", help="snapshot to write (.jsonl or .jsonl.gz)")
+    build.add_argument("--version", help="snapshot version (default: content digest)")
+
+    stats = commands.add_parser("stats", help="load a snapshot and report load time and memory")
+    stats.add_argument("path", nargs="?", help="snapshot path (default: packaged catalog)")
+
+    compile_ = commands.add_parser("compile", help="precompile the indexed catalog into an artifact")
+    compile_.add_argument("snapshot", nargs="?", help="snapshot path (default: packaged catalog)")
+    compile_.add_argument("artifact", nargs="?", help="artifact path (default: shared/catalog.pkl)")
+
+    args = parser.parse_args()
+    if args.command == "build":
+        products = sorted((normalize_product(row) for row in iter_rows(args.source)), key=lambda p: p["id"])
+        version = write_snapshot(products, args.output, args.version)
+        print(json.dumps({"output": args.output, "version": version, "count": len(products)}))
+    elif args.command == "compile":
+        # Pickle classes from the importable module, not from __main__ under "python -m"
+        from shared.catalog import compile_catalog as compile_importable
+
+        catalog = compile_importable(args.snapshot, args.artifact)
+        print(json.dumps({"artifact": args.artifact or artifact_path(), "version": catalog.version}))
+    else:
+        catalog = load_catalog(args.path, measure_memory=True)
+        print(json.dumps({"version": catalog.version, "generation": catalog.generation, **catalog.stats._asdict()}))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""In-process latency histograms and counters for the Python Lambda handlers.
+
+Traces are sampled and arrive late; these metrics are always on and cheap.
+Each route keeps one fixed-bucket histogram per stage (parse, sort, filter,
+serialize, total, ...) and a few counters (cache.hit, cache.miss, status
+codes). Buckets are preallocated, so recording a sample is a bisect and
+two additions under an uncontended lock.
+
+The numbers are per process (per Lambda execution environment or per
+gunicorn worker). They are served by each handler's ``/metrics`` route and
+written to the log as one JSON line when the process shuts down (SIGTERM
+or interpreter exit), so the log pipeline can turn them into metrics.
+"""
+
+from __future__ import annotations
+
+import atexit
+import bisect
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+# Upper bucket bounds in seconds: 1-2-5 steps from 1us to 10s; larger samples land in a final overflow bucket
+BUCKET_BOUNDS = tuple(round(m * 10.0**e, 6) for e in range(-6, 1) for m in (1, 2, 5)) + (10.0,)
+
+_started = time.time()
+
+
+class Histogram:
+    """Fixed-bucket latency histogram."""
+
+    __slots__ = ("counts", "count", "total", "max", "_lock")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(BUCKET_BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        """Record one sample."""
+        index = bisect.bisect_left(BUCKET_BOUNDS, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (capped at the observed max)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return min(BUCKET_BOUNDS[index], self.max) if index < len(BUCKET_BOUNDS) else self.max
+        return self.max
+
+    def snapshot(self) -> dict[str, Any]:
+        """Summary in milliseconds, with the non-empty buckets as [upper bound ms, count] pairs."""
+        with self._lock:
+            return {
+                "count": self.count,
+                "sumMs": self.total * 1000,
+                "maxMs": self.max * 1000,
+                "p50Ms": self.quantile(0.50) * 1000,
+                "p90Ms": self.quantile(0.90) * 1000,
+                "p99Ms": self.quantile(0.99) * 1000,
+                "buckets": [
+                    [BUCKET_BOUNDS[i] * 1000 if i < len(BUCKET_BOUNDS) else None, n]
+                    for i, n in enumerate(self.counts)
+                    if n
+                ],
+            }
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_start")
+
+    def __init__(self, histogram: Histogram) -> None:
+        self._histogram = histogram
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._histogram.observe(time.perf_counter() - self._start)
+
+
+class RouteMetrics:
+    """Stage histograms and counters of one route."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.stages: dict[str, Histogram] = {}
+        self.counters: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, stage: str) -> Histogram:
+        """Histogram of a stage, created on first use."""
+        histogram = self.stages.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self.stages.setdefault(stage, Histogram())
+        return histogram
+
+    def timer(self, stage: str) -> _Timer:
+        """Context manager recording the duration of its block into a stage histogram."""
+        return _Timer(self.histogram(stage))
+
+    def observe(self, stage: str, seconds: float) -> None:
+        self.histogram(stage).observe(seconds)
+
+    def increment(self, counter: str, value: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + value
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            stages = dict(self.stages)
+            counters = dict(self.counters)
+        return {"stages": {stage: h.snapshot() for stage, h in stages.items()}, "counters": counters}
+
+
+_routes: dict[str, RouteMetrics] = {}
+_routes_lock = threading.Lock()
+
+
+def route(name: str) -> RouteMetrics:
+    """Metrics of a route, created on first use."""
+    metrics = _routes.get(name)
+    if metrics is None:
+        with _routes_lock:
+            metrics = _routes.setdefault(name, RouteMetrics(name))
+    return metrics
+
+
+def snapshot(service: str | None = None) -> dict[str, Any]:
+    """All routes' metrics for this process."""
+    with _routes_lock:
+        routes = dict(_routes)
+    return {
+        "service": service,
+        "pid": os.getpid(),
+        "uptimeSeconds": time.time() - _started,
+        "routes": {name: metrics.snapshot() for name, metrics in routes.items()},
+    }
+
+
+def reset() -> None:
+    """Drop all recorded metrics (benchmarks)."""
+    with _routes_lock:
+        _routes.clear()
+
+
+def middleware(name: str) -> Callable[[dict[str, Any], Callable[[dict[str, Any]], dict[str, Any]]], dict[str, Any]]:
+    """Router middleware recording a route's end-to-end latency and status codes.
+
+    Place it first in the route's middleware so compression is included.
+    """
+    metrics = route(name)
+    total = metrics.histogram("total")
+
+    def record(event: dict[str, Any], call_next: Callable[[dict[str, Any]], dict[str, Any]]) -> dict[str, Any]:
+        start = time.perf_counter()
+        response = call_next(event)
+        total.observe(time.perf_counter() - start)
+        metrics.increment(f"status.{response.get('statusCode')}")
+        return response
+
+    return record
+
+
+def metrics_handler(service: str) -> Callable[[dict[str, Any]], dict[str, Any]]:
+    """Route handler serving this process's snapshot as JSON (the /metrics route)."""
+    from shared.utils import json_response
+
+    def handle(event: dict[str, Any]) -> dict[str, Any]:
+        return json_response(snapshot(service), headers={"Cache-Control": "no-store"})
+
+    return handle
+
+
+_flush_service: str | None = None
+_flushed = False
+
+
+def flush(reason: str = "shutdown") -> None:
+    """Write the aggregated metrics to the log as one JSON line (once per process, if anything was recorded)."""
+    global _flushed
+    if _flushed or not any(
+        metrics.counters or any(h.count for h in list(metrics.stages.values())) for metrics in list(_routes.values())
+    ):
+        return
+    _flushed = True
+    from shared.utils import encode_json
+
+    record = {"type": "metrics", "reason": reason, **snapshot(_flush_service)}
+    logger.info("%s", encode_json(record).decode("utf-8"))
+
+
+def _on_sigterm(previous: Any) -> Callable[[int, Any], None]:
+    def handle(signum: int, frame: Any) -> None:
+        flush("sigterm")
+        if callable(previous):
+            previous(signum, frame)
+        elif previous != signal.SIG_IGN:
+            sys.exit(128 + signum)
+
+    return handle
+
+
+def install_shutdown_flush(service: str) -> None:
+    """Flush metrics at interpreter exit and on SIGTERM (Lambda shutdown).
+
+    Safe to call from every handler module; only the first call installs the
+    hooks. Servers that install their own SIGTERM handler later (gunicorn,
+    uvicorn) still get the exit-time flush.
+    """
+    global _flush_service
+    if _flush_service is not None:
+        return
+    _flush_service = service
+    atexit.register(flush, "exit")
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, _on_sigterm(signal.getsignal(signal.SIGTERM)))
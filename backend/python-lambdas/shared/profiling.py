@@ -0,0 +1,298 @@
+"""Opt-in per-request profiling for the Python Lambda handlers.
+
+When a query shape is slow in production, selected requests can be
+profiled and their stacks written in the collapsed format that flamegraph
+tools read (``frame;frame;frame value`` per line, e.g. flamegraph.pl or
+speedscope).
+
+Disabled unless PROFILE_REQUESTS is set. When disabled, or when any of the
+settings below is invalid (logged as a warning), Router.compile() does not
+install the hook, so requests run exactly the same code as without this
+module.
+
+Environment:
+    PROFILE_REQUESTS         "off" (default), "header" (requests sending
+                             X-Profile), or "sample" (a random share of
+                             requests, plus header requests).
+    PROFILE_TOKEN            Secret that X-Profile must equal. Without it
+                             the header is ignored, and "header" mode stays
+                             off: profiling slows a request several times
+                             and writes a file, so anonymous clients must
+                             not be able to trigger it.
+    PROFILE_SAMPLE_RATE      Share of requests in "sample" mode (default 0.01).
+    PROFILE_MATCH            Regex on "<path>?<sorted query>"; only matching
+                             requests are profiled (default: all).
+    PROFILE_MAX_PER_MINUTE   Rate limit across the process (default 6).
+    PROFILER                 "trace" (default): every call is recorded
+                             through the interpreter's profile hook, the
+                             same mechanism cProfile uses, keeping full
+                             stacks; values are microseconds of own time.
+                             Exact, right for short requests.
+                             "sampler": a thread samples the request's
+                             stack; values are sample counts. Lower
+                             overhead, for slow requests.
+    PROFILE_INTERVAL_MS      Sampler interval (default 1).
+    PROFILE_OUTPUT           Directory for <id>.collapsed files (default
+                             /tmp/profiles), or "log" to log the stacks.
+    PROFILE_MAX_FILES        Profiles kept in PROFILE_OUTPUT; the oldest
+                             are deleted beyond it (default 50).
+
+Profiled responses carry an X-Profile-Id header naming the output.
+"""
+
+from __future__ import annotations
+
+import glob
+import hmac
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+from typing import Any, Callable
+
+from shared.utils import Handler, Middleware, get_header, request_path
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("off", "header", "sample")
+PROFILERS = ("trace", "sampler")
+
+
+class RateLimiter:
+    """Token bucket: at most per_minute acquisitions per minute, refilled continuously."""
+
+    def __init__(self, per_minute: float) -> None:
+        self.capacity = max(per_minute, 0.0)
+        self.tokens = self.capacity
+        self.rate = self.capacity / 60.0
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+def _frame_label(filename: str, name: str) -> str:
+    module = os.path.splitext(os.path.basename(filename))[0] if filename not in ("~", "") else "builtins"
+    return f"{module}:{name}".replace(";", ":")
+
+
+def _code_label(code: Any) -> str:
+    return _frame_label(code.co_filename, getattr(code, "co_qualname", code.co_name))
+
+
+class _CallTracer:
+    """Records the current thread's calls through sys.setprofile as collapsed stacks of own time."""
+
+    def __init__(self) -> None:
+        self.stacks: dict[str, float] = {}
+        # [label, start, time spent in callees] per active call
+        self._calls: list[list[Any]] = []
+        self._labels: list[str] = []
+
+    def _hook(self, frame: Any, event: str, arg: Any) -> None:
+        now = time.perf_counter()
+        if event == "call":
+            label = _code_label(frame.f_code)
+        elif event == "c_call":
+            label = f"{getattr(arg, '__module__', None) or 'builtins'}:{getattr(arg, '__qualname__', repr(arg))}"
+        else:
+            # return, c_return, c_exception
+            if not self._calls:
+                return
+            label, start, inner = self._calls.pop()
+            key = ";".join(self._labels)
+            self._labels.pop()
+            elapsed = now - start
+            self.stacks[key] = self.stacks.get(key, 0.0) + elapsed - inner
+            if self._calls:
+                self._calls[-1][2] += elapsed
+            return
+        self._labels.append(label.replace(";", ":"))
+        self._calls.append([label, now, 0.0])
+
+    def __enter__(self) -> _CallTracer:
+        sys.setprofile(self._hook)
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        sys.setprofile(None)
+
+    def collapsed(self) -> dict[str, int]:
+        return {stack: int(seconds * 1e6) for stack, seconds in self.stacks.items() if seconds > 0}
+
+
+class _StackSampler(threading.Thread):
+    """Samples one thread's Python stack at a fixed interval into collapsed counts."""
+
+    def __init__(self, thread_id: int, interval: float) -> None:
+        super().__init__(daemon=True, name="profile-sampler")
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: dict[str, int] = {}
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_code_label(frame.f_code))
+                frame = frame.f_back
+            if labels:
+                key = ";".join(reversed(labels))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+
+    def stop(self) -> dict[str, int]:
+        self._stop_event.set()
+        self.join()
+        return self.stacks
+
+
+class RequestProfiler:
+    """Decides which requests to profile and profiles them."""
+
+    def __init__(self, environ: Any = os.environ) -> None:
+        # One profile at a time: the sampler changes the process-wide switch interval
+        self._busy = threading.Lock()
+        self._count = 0
+        self.enabled = False
+        try:
+            self._configure(environ)
+        except (ValueError, re.error) as e:
+            # A debugging hook must never take down serving
+            logger.warning("Invalid request profiling configuration (%s); request profiling stays disabled", e)
+            self.enabled = False
+
+    def _configure(self, environ: Any) -> None:
+        """Read the settings from environ; raises ValueError or re.error on invalid values."""
+        self.mode = environ.get("PROFILE_REQUESTS", "off").lower()
+        if self.mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown PROFILE_REQUESTS {self.mode!r}; expected one of {', '.join(PROFILE_MODES)}")
+        self.profiler = environ.get("PROFILER", "trace").lower()
+        if self.profiler not in PROFILERS:
+            raise ValueError(f"Unknown PROFILER {self.profiler!r}; expected one of {', '.join(PROFILERS)}")
+        self.token = environ.get("PROFILE_TOKEN") or None
+        self.sample_rate = float(environ.get("PROFILE_SAMPLE_RATE", "0.01"))
+        match = environ.get("PROFILE_MATCH")
+        self.match = re.compile(match) if match else None
+        self.limiter = RateLimiter(float(environ.get("PROFILE_MAX_PER_MINUTE", "6")))
+        self.interval = float(environ.get("PROFILE_INTERVAL_MS", "1")) / 1000
+        self.output = environ.get("PROFILE_OUTPUT", "/tmp/profiles")
+        self.max_files = int(environ.get("PROFILE_MAX_FILES", "50"))
+        self.enabled = self.mode == "sample" or (self.mode == "header" and self.token is not None)
+        if self.mode == "header" and self.token is None:
+            logger.error("PROFILE_REQUESTS=header requires PROFILE_TOKEN; request profiling stays disabled")
+        elif self.mode == "sample" and self.token is None:
+            logger.warning("PROFILE_TOKEN is not set; X-Profile headers are ignored, only sampled requests are profiled")
+
+    def selected(self, event: dict[str, Any]) -> bool:
+        """Whether this request should be profiled (before rate limiting)."""
+        token = self.token
+        requested = get_header(event, "X-Profile") if token else None
+        if requested and token:
+            chosen = hmac.compare_digest(requested.encode("utf-8"), token.encode("utf-8"))
+        else:
+            chosen = self.mode == "sample" and random.random() < self.sample_rate
+        if chosen and self.match is not None:
+            params = event.get("queryStringParameters") or {}
+            shape = request_path(event) + "?" + "&".join(f"{k}={v}" for k, v in sorted(params.items()))
+            chosen = self.match.search(shape) is not None
+        return chosen
+
+    def middleware(self, route: str) -> Middleware:
+        """Outermost middleware for a route (installed by Router.compile when enabled)."""
+
+        def profile(event: dict[str, Any], call_next: Handler) -> dict[str, Any]:
+            if not self.selected(event) or not self.limiter.acquire():
+                return call_next(event)
+            if not self._busy.acquire(blocking=False):
+                return call_next(event)
+            try:
+                return self._profile(route, event, call_next)
+            finally:
+                self._busy.release()
+
+        return profile
+
+    def _profile(self, route: str, event: dict[str, Any], call_next: Handler) -> dict[str, Any]:
+        self._count += 1
+        profile_id = f"{route.strip('/').replace('/', '_') or 'root'}-{int(time.time())}-{os.getpid()}-{self._count}"
+        started = time.perf_counter()
+        if self.profiler == "trace":
+            tracer = _CallTracer()
+            with tracer:
+                response = call_next(event)
+            stacks = tracer.collapsed()
+        else:
+            sampler = _StackSampler(threading.get_ident(), self.interval)
+            # Let the sampler thread take the GIL at its interval while the request runs
+            switch_interval = sys.getswitchinterval()
+            sys.setswitchinterval(min(switch_interval, self.interval))
+            sampler.start()
+            try:
+                response = call_next(event)
+            finally:
+                stacks = sampler.stop()
+                sys.setswitchinterval(switch_interval)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+
+        try:
+            self._write(profile_id, stacks, elapsed_ms)
+        except OSError:
+            logger.exception("Could not write profile %s", profile_id)
+        response.setdefault("headers", {})["X-Profile-Id"] = profile_id
+        return response
+
+    def _write(self, profile_id: str, stacks: dict[str, int], elapsed_ms: float) -> None:
+        lines = [f"{stack} {value}" for stack, value in sorted(stacks.items())]
+        unit = "us" if self.profiler == "trace" else "samples"
+        if self.output == "log":
+            logger.info(
+                "Profile %s (%s, %.1f ms, values in %s):\n%s", profile_id, self.profiler, elapsed_ms, unit, "\n".join(lines)
+            )
+            return
+        os.makedirs(self.output, exist_ok=True)
+        path = os.path.join(self.output, f"{profile_id}.collapsed")
+        with open(path, "w") as out:
+            out.write("\n".join(lines) + "\n")
+        self._prune()
+        logger.info("Profile %s written to %s (%s, %.1f ms, values in %s)", profile_id, path, self.profiler, elapsed_ms, unit)
+
+    def _prune(self) -> None:
+        """Delete the oldest profiles beyond max_files (/tmp is small and persists across Lambda invocations)."""
+        files = glob.glob(os.path.join(self.output, "*.collapsed"))
+        if len(files) <= self.max_files:
+            return
+        files.sort(key=os.path.getmtime)
+        for stale in files[: len(files) - self.max_files]:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass
+
+
+_profiler: RequestProfiler | None = None
+
+
+def request_profiler() -> RequestProfiler:
+    """The process-wide profiler, configured from the environment on first use."""
+    global _profiler
+    if _profiler is None:
+        _profiler = RequestProfiler()
+    return _profiler
+
+
+def profiling_middleware(route: str) -> Callable[[dict[str, Any], Handler], dict[str, Any]]:
+    """Profiling middleware for a route, bound to the process-wide profiler."""
+    return request_profiler().middleware(route)
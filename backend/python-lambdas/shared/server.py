@@ -0,0 +1,161 @@
+"""HTTP runner for the Python Lambda handlers in containers.
+
+Wraps a service's ``_handler`` in a Flask app that translates requests to
+API Gateway events, so the same code path serves Lambda and Docker. In the
+images the app is served by gunicorn (see gunicorn.conf.py)::
+
+    gunicorn "shared.server:create_app('search')"
+
+The app is preloaded in the gunicorn master, so the catalog and its indexes
+are built once and shared copy-on-write by every forked worker. Each service's
+``/metrics`` route reports the worker process that happens to serve it; see
+shared.metrics. For local debugging the Flask development server is still
+available::
+
+    python -m shared.server search
+"""
+
+from __future__ import annotations
+
+import base64
+import importlib
+import logging
+import os
+import sys
+from typing import Any, Callable, NamedTuple
+
+
+class ServiceSpec(NamedTuple):
+    """How to serve one Lambda service over HTTP."""
+
+    name: str
+    handler_module: str
+    routes: tuple[tuple[str, tuple[str, ...]], ...]
+    port: int
+    uses_catalog: bool
+
+
+SERVICES = {
+    "search": ServiceSpec(
+        name="kelvo-ecomm-search",
+        handler_module="search.handler",
+        routes=(("/api/search", ("GET", "OPTIONS")), ("/metrics", ("GET",))),
+        port=3004,
+        uses_catalog=True,
+    ),
+    "recommendations": ServiceSpec(
+        name="kelvo-ecomm-recommendations",
+        handler_module="recommendations.handler",
+        routes=(("/api/recommendations", ("GET", "OPTIONS")), ("/metrics", ("GET",))),
+        port=3005,
+        uses_catalog=True,
+    ),
+    "notifications": ServiceSpec(
+        name="kelvo-ecomm-notifications",
+        handler_module="notifications.handler",
+        routes=(("/api/notifications/<path:subpath>", ("POST", "OPTIONS")), ("/metrics", ("GET",))),
+        port=3006,
+        uses_catalog=False,
+    ),
+}
+
+# Set by create_app() so the gunicorn post_fork hook knows whether to start a catalog reloader
+_reload_catalog_after_fork = False
+
+
+def configure_logging(service_name: str) -> None:
+    """Emit JSON logs tagged with the service name, as the Datadog log pipeline expects."""
+    from pythonjsonlogger import jsonlogger
+
+    handler = logging.StreamHandler()
+    handler.setFormatter(
+        jsonlogger.JsonFormatter(
+            fmt="%(asctime)s %(levelname)s %(name)s %(message)s",
+            rename_fields={"asctime": "timestamp", "levelname": "level", "name": "logger"},
+            static_fields={"service": service_name},
+        )
+    )
+    logging.root.handlers = [handler]
+    logging.root.setLevel(logging.INFO)
+
+
+def make_event(request: Any) -> dict[str, Any]:
+    """Translate a Flask request into an API Gateway proxy event."""
+    return {
+        "httpMethod": request.method,
+        "path": request.path,
+        "queryStringParameters": request.args.to_dict(),
+        "body": request.get_data(as_text=True) or None,
+        "headers": dict(request.headers),
+    }
+
+
+def to_flask_response(app: Any, result: dict[str, Any]) -> Any:
+    """Translate an API Gateway response dict into a Flask response."""
+    body = result["body"]
+    if result.get("isBase64Encoded"):
+        body = base64.b64decode(body)
+    return app.response_class(
+        body, status=result["statusCode"], headers=result.get("headers", {}), mimetype="application/json"
+    )
+
+
+def create_app(service: str, preload: bool = True) -> Any:
+    """Build the Flask app serving one Lambda service.
+
+    Args:
+        service: Key of SERVICES ("search", "recommendations", "notifications").
+        preload: Load the catalog now (in the gunicorn master when preloading).
+
+    Returns:
+        WSGI application.
+    """
+    global _reload_catalog_after_fork
+    from flask import Flask, jsonify, request
+    from flask_cors import CORS
+
+    spec = SERVICES[service]
+    configure_logging(spec.name)
+    handler: Callable[[dict[str, Any], Any], dict[str, Any]] = importlib.import_module(spec.handler_module)._handler
+
+    if spec.uses_catalog and preload:
+        from shared.catalog import get_catalog
+
+        get_catalog()
+    _reload_catalog_after_fork = spec.uses_catalog
+
+    app = Flask(spec.name)
+    CORS(app)
+
+    def invoke(**_: Any) -> Any:
+        return to_flask_response(app, handler(make_event(request), {}))
+
+    for rule, methods in spec.routes:
+        app.add_url_rule(rule, endpoint=rule, view_func=invoke, methods=list(methods))
+
+    @app.route("/health", methods=["GET"])
+    def health() -> Any:
+        return jsonify({"status": "healthy", "service": spec.name})
+
+    return app
+
+
+def after_fork() -> None:
+    """Per-worker setup after gunicorn forks: background threads do not survive fork()."""
+    if _reload_catalog_after_fork:
+        from shared.catalog import start_catalog_reloader
+
+        start_catalog_reloader()
+
+
+def main() -> None:
+    service = sys.argv[1] if len(sys.argv) > 1 else os.environ.get("SERVICE", "")
+    if service not in SERVICES:
+        sys.exit(f"usage: python -m shared.server {{{'|'.join(SERVICES)}}}")
+    app = create_app(service)
+    after_fork()
+    app.run(host="0.0.0.0", port=int(os.environ.get("PORT", SERVICES[service].port)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Request coalescing (single-flight) for identical concurrent queries.
+
+During flash sales many identical search and recommendation requests
+arrive at the same moment, and on the threaded runners each of them would
+compute the same response. A SingleFlight group lets the first request for
+a key (the leader) compute it while concurrent requests with the same key
+wait and share the leader's result. Nothing is kept once the computation
+finishes: only requests that overlap in time are merged, so this sits in
+front of any result cache rather than replacing one.
+
+Keys must cover everything the result depends on: the route, the
+normalized query and the catalog generation.
+
+If the leader raises, every waiting request re-raises the same exception.
+If the leader has not finished within the timeout, the first waiter to time
+out is elected as a second leader for the same key and computes the result
+too. Whichever of the two finishes first serves every waiter, including
+the ones that arrive later. The other waiters keep waiting instead of
+computing, so a slow computation costs at most two computations per key,
+not one per waiting request.
+
+In Lambda an execution environment serves one request at a time, so there
+is never anything to coalesce and the cost is one uncontended lock.
+
+Environment:
+    SINGLEFLIGHT              "on" (default) or "off".
+    SINGLEFLIGHT_TIMEOUT_MS   How long waiters wait before electing a second
+                              leader (default 2000).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from typing import Any, Callable, Hashable, TypeVar
+
+from shared import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class _Call:
+    """One in-flight computation; done is held until the first leader publishes the result."""
+
+    __slots__ = ("done", "result", "error", "finished", "backup")
+
+    def __init__(self) -> None:
+        self.done = threading.Lock()
+        self.done.acquire()
+        self.result: Any = None
+        self.error: BaseException | None = None
+        # Guarded by SingleFlight._lock
+        self.finished = False
+        self.backup = False
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one computation.
+
+    Records ``singleflight.shared`` (requests served by another request's
+    computation) and ``singleflight.timeout`` (second leaders elected)
+    counters on the route's metrics.
+    """
+
+    def __init__(self, route: str, timeout: float | None = None, enabled: bool | None = None) -> None:
+        self.route = route
+        self.timeout = float(os.environ.get("SINGLEFLIGHT_TIMEOUT_MS", "2000")) / 1000 if timeout is None else timeout
+        self.enabled = os.environ.get("SINGLEFLIGHT", "on").lower() != "off" if enabled is None else enabled
+        self.stats = metrics.route(route)
+        self._calls: dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, compute: Callable[[], T]) -> T:
+        """Return compute()'s result, sharing it with concurrent calls for the same key.
+
+        The result is handed to every caller as is; callers must copy it
+        before modifying it.
+        """
+        if not self.enabled:
+            return compute()
+
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+        if leader:
+            return self._lead(key, call, compute)
+
+        while not call.done.acquire(timeout=self.timeout):
+            with self._lock:
+                elected = not call.finished and not call.backup
+                if elected:
+                    call.backup = True
+            if elected:
+                self.stats.increment("singleflight.timeout")
+                logger.warning(
+                    "Identical %s request still running after %.0f ms; computing it a second time",
+                    self.route,
+                    self.timeout * 1000,
+                )
+                return self._lead(key, call, compute)
+        # Pass the lock on to the next waiter
+        call.done.release()
+        self.stats.increment("singleflight.shared")
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def _lead(self, key: Hashable, call: _Call, compute: Callable[[], T]) -> T:
+        """Compute as a leader of call; the first leader to finish publishes its outcome to the waiters."""
+        try:
+            result = compute()
+        except BaseException as e:
+            self._publish(key, call, None, e)
+            raise
+        self._publish(key, call, result, None)
+        return result
+
+    def _publish(self, key: Hashable, call: _Call, result: Any, error: BaseException | None) -> None:
+        with self._lock:
+            if call.finished:
+                return
+            call.finished = True
+            call.result, call.error = result, error
+            del self._calls[key]
+        call.done.release()
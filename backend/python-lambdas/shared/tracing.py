@@ -0,0 +1,281 @@
+"""Lazily imported Datadog instrumentation for Kelvo E-Comm Python Lambda functions.
+
+Importing ddtrace and datadog_lambda dominates cold start when appsec, IAST
+and dynamic instrumentation are enabled. Handlers use the proxies below so
+that cost is paid on first use instead of at module import.
+
+Handler spans go through a tracing policy (trace_request) so their overhead
+can be tuned per deployment:
+
+    TRACE_MODE                  "full" (default): one span per step.
+                                "aggregate": one span per request; steps are
+                                timed and counted into metrics on it.
+                                "off": no handler spans (no-op fast path).
+    TRACE_SAMPLE_RATE           Fraction of requests that get handler spans
+                                (default 1.0).
+    TRACE_SAMPLE_RATE_<ROUTE>   Per-route override, e.g. TRACE_SAMPLE_RATE_SEARCH.
+
+The policy only covers the handlers' own spans; the Lambda invocation span
+from datadog_lambda and ddtrace's integrations are unaffected.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import logging
+import os
+import random
+import time
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class _NoopTracer:
+    """Stand-in used when ddtrace is not installed (local runs, benchmarks)."""
+
+    def trace(self, *args: Any, **kwargs: Any) -> contextlib.nullcontext[None]:
+        return contextlib.nullcontext()
+
+    def current_span(self) -> None:
+        return None
+
+
+class LazyTracer:
+    """Proxy for ``ddtrace.tracer`` that imports ddtrace on first attribute access."""
+
+    def __init__(self) -> None:
+        self._tracer: Any = None
+
+    def _load(self) -> Any:
+        try:
+            from ddtrace import tracer
+        except ImportError:
+            logger.warning("ddtrace not installed; spans are disabled")
+            tracer = _NoopTracer()
+        self._tracer = tracer
+        return tracer
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._tracer or self._load(), name)
+
+
+tracer = LazyTracer()
+
+
+def datadog_handler(func: Callable[[dict[str, Any], Any], dict[str, Any]]) -> Callable[[dict[str, Any], Any], dict[str, Any]]:
+    """Wrap a Lambda handler with ``datadog_lambda_wrapper`` on its first invocation."""
+    wrapped: Callable[[dict[str, Any], Any], dict[str, Any]] | None = None
+
+    @functools.wraps(func)
+    def entry(event: dict[str, Any], context: Any) -> dict[str, Any]:
+        nonlocal wrapped
+        if wrapped is None:
+            from datadog_lambda.wrapper import datadog_lambda_wrapper
+
+            wrapped = datadog_lambda_wrapper(func)
+        return wrapped(event, context)
+
+    return entry
+
+
+TRACE_MODES = ("full", "aggregate", "off")
+
+_trace_mode = "full"
+_sample_rates: dict[str, float] = {}
+
+
+def set_trace_mode(mode: str | None = None) -> str:
+    """Select the tracing policy mode.
+
+    Args:
+        mode: One of TRACE_MODES. Defaults to the TRACE_MODE env var, or "full".
+
+    Returns:
+        The mode now in effect.
+
+    Raises:
+        ValueError: If mode is not one of TRACE_MODES.
+    """
+    global _trace_mode
+    mode = (mode or os.environ.get("TRACE_MODE") or "full").lower()
+    if mode not in TRACE_MODES:
+        raise ValueError(f"Unknown trace mode {mode!r}; expected one of {', '.join(TRACE_MODES)}")
+    _trace_mode = mode
+    return mode
+
+
+def get_trace_mode() -> str:
+    """Return the active tracing policy mode."""
+    return _trace_mode
+
+
+def set_sample_rate(route: str, rate: float | None) -> None:
+    """Override the sample rate of a route; None reverts to the environment."""
+    if rate is None:
+        _sample_rates.pop(route, None)
+    else:
+        _sample_rates[route] = min(max(rate, 0.0), 1.0)
+
+
+def sample_rate(route: str) -> float:
+    """Fraction of a route's requests that get handler spans."""
+    rate = _sample_rates.get(route)
+    if rate is None:
+        value = os.environ.get(f"TRACE_SAMPLE_RATE_{route.upper()}") or os.environ.get("TRACE_SAMPLE_RATE") or "1"
+        try:
+            rate = min(max(float(value), 0.0), 1.0)
+        except ValueError:
+            logger.warning("Invalid trace sample rate %r for route %s; using 1.0", value, route)
+            rate = 1.0
+        _sample_rates[route] = rate
+    return rate
+
+
+_NULL_CONTEXT = contextlib.nullcontext()
+
+
+class _NoopRequestTrace:
+    """Fast path for disabled or unsampled requests: every step is the same null context."""
+
+    def __enter__(self) -> _NoopRequestTrace:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def step(self, name: str) -> contextlib.nullcontext[None]:
+        return _NULL_CONTEXT
+
+    def count(self, name: str, value: float = 1) -> None:
+        return None
+
+
+_NOOP_REQUEST_TRACE = _NoopRequestTrace()
+
+
+class _FullRequestTrace:
+    """One span per request (if named) and one child span per step."""
+
+    def __init__(self, name: str | None, service: str) -> None:
+        self._name = name
+        self._service = service
+        self._context: Any = None
+
+    def __enter__(self) -> _FullRequestTrace:
+        if self._name:
+            self._context = tracer.trace(self._name, service=self._service)
+            self._context.__enter__()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._context is not None:
+            self._context.__exit__(*exc_info)
+
+    def step(self, name: str) -> Any:
+        return tracer.trace(name, service=self._service)
+
+    def count(self, name: str, value: float = 1) -> None:
+        span = tracer.current_span()
+        if span is not None:
+            span.set_metric(name, value)
+
+
+class _AggregateStep:
+    __slots__ = ("_trace", "_name", "_start")
+
+    def __init__(self, trace: _AggregateRequestTrace, name: str) -> None:
+        self._trace = trace
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._start = time.perf_counter()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._trace._record(self._name, time.perf_counter() - self._start)
+
+
+class _AggregateRequestTrace:
+    """One span per request; steps become <step>.count and <step>.ms metrics on it.
+
+    Without a request span name, the metrics go on the active span (normally
+    the Lambda invocation span).
+    """
+
+    def __init__(self, name: str | None, service: str) -> None:
+        self._name = name
+        self._service = service
+        self._context: Any = None
+        self._span: Any = None
+        self._steps: dict[str, list[float]] = {}
+        self._counters: dict[str, float] = {}
+
+    def __enter__(self) -> _AggregateRequestTrace:
+        if self._name:
+            self._context = tracer.trace(self._name, service=self._service)
+            self._span = self._context.__enter__()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        span = self._span if self._context is not None else tracer.current_span()
+        if span is not None:
+            for name, (count, seconds) in self._steps.items():
+                span.set_metric(f"{name}.count", count)
+                span.set_metric(f"{name}.ms", seconds * 1000)
+            for name, value in self._counters.items():
+                span.set_metric(name, value)
+        if self._context is not None:
+            self._context.__exit__(*exc_info)
+
+    def _record(self, name: str, seconds: float) -> None:
+        totals = self._steps.get(name)
+        if totals is None:
+            self._steps[name] = [1, seconds]
+        else:
+            totals[0] += 1
+            totals[1] += seconds
+
+    def step(self, name: str) -> _AggregateStep:
+        return _AggregateStep(self, name)
+
+    def count(self, name: str, value: float = 1) -> None:
+        self._counters[name] = self._counters.get(name, 0) + value
+
+
+def trace_request(route: str, service: str, name: str | None = None) -> Any:
+    """Open the handler-level trace of one request under the tracing policy.
+
+    Use as a context manager; wrap each unit of work in ``trace.step(name)``
+    and record sizes with ``trace.count(name, value)``::
+
+        with trace_request("search", SERVICE, "search.query") as trace:
+            with trace.step("search.filter"):
+                ...
+
+    Args:
+        route: Route name, used to look up the sample rate.
+        service: Datadog service name for the spans.
+        name: Name of the request span; None to hang steps off the active span.
+
+    Returns:
+        A request trace; the shared no-op trace when tracing is off or the
+        request is not sampled.
+    """
+    mode = _trace_mode
+    if mode == "off":
+        return _NOOP_REQUEST_TRACE
+    rate = _sample_rates.get(route)
+    if rate is None:
+        rate = sample_rate(route)
+    if rate < 1.0 and random.random() >= rate:
+        return _NOOP_REQUEST_TRACE
+    if mode == "aggregate":
+        return _AggregateRequestTrace(name, service)
+    return _FullRequestTrace(name, service)
+
+
+try:
+    set_trace_mode()
+except ValueError as exc:
+    logger.warning("%s; using full tracing", exc)
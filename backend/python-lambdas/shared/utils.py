@@ -1,14 +1,21 @@
 """Shared utilities for Kelvo E-Comm Python Lambda functions.
 
-Provides JSON/error response helpers, Datadog trace context propagation,
-and mock product data consistent with the Java order service.
+Provides JSON/error response helpers, conditional GET and compression
+support, the request router shared by the handlers, and Datadog trace
+context propagation. The product catalog itself
+lives in shared.catalog.
 """
 
 from __future__ import annotations
 
+import base64
+import gzip
 import json
 import logging
-from typing import Any
+import os
+import threading
+import zlib
+from typing import Any, Callable, Sequence
 
 logger = logging.getLogger(__name__)
 
@@ -20,15 +27,121 @@ CORS_HEADERS = {
 }
 
 
+# Serializer backends in order of preference. Each encodes compactly to UTF-8 bytes.
+JSON_BACKENDS = ("orjson", "ujson", "json")
+
+
+_stdlib_encoder = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False)
+
+
+def _stdlib_json_dumps(obj: Any) -> bytes:
+    """Compact encoding with the stdlib json module (the "json" backend and the fallback of the others)."""
+    return _stdlib_encoder.encode(obj).encode("utf-8")
+
+
+def _load_json_backend(name: str) -> Callable[[Any], bytes]:
+    """Return a compact ``obj -> bytes`` encoder for the named backend.
+
+    The orjson and ujson encoders fall back to the stdlib encoder for input
+    they reject but json accepts, such as integers beyond 64 bits.
+
+    Raises:
+        ImportError: If the backend library is not installed.
+        ValueError: If the backend name is unknown.
+    """
+    if name == "orjson":
+        import orjson
+
+        dumps = orjson.dumps
+
+        def _orjson_dumps(obj: Any) -> bytes:
+            try:
+                return dumps(obj)
+            except TypeError:
+                # orjson.JSONEncodeError, e.g. "Integer exceeds 64-bit range"
+                return _stdlib_json_dumps(obj)
+
+        return _orjson_dumps
+    if name == "ujson":
+        import ujson
+
+        def _ujson_dumps(obj: Any) -> bytes:
+            try:
+                return ujson.dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+            except (OverflowError, TypeError):
+                return _stdlib_json_dumps(obj)
+
+        return _ujson_dumps
+    if name == "json":
+        return _stdlib_json_dumps
+    raise ValueError(f"Unknown JSON backend: {name}")
+
+
+def _resolve_json_backend(obj: Any) -> bytes:
+    """Initial encoder: selects the backend on first use (keeps orjson off the import path)."""
+    set_json_backend()
+    return _json_dumps(obj)
+
+
+_json_backend_name = "json"
+_json_dumps: Callable[[Any], bytes] = _resolve_json_backend
+
+
+def set_json_backend(name: str | None = None) -> str:
+    """Select the serializer used by json_response.
+
+    Args:
+        name: One of JSON_BACKENDS. If None, tries the JSON_BACKEND env var
+            and then each installed backend in JSON_BACKENDS order.
+
+    Returns:
+        Name of the backend now in use.
+
+    Raises:
+        ImportError: If an explicitly requested backend is not installed.
+        ValueError: If an explicitly requested backend is unknown.
+    """
+    global _json_backend_name, _json_dumps
+    if name:
+        candidates: tuple[str, ...] = (name,)
+    else:
+        preferred = os.environ.get("JSON_BACKEND")
+        candidates = ((preferred,) if preferred else ()) + JSON_BACKENDS
+    for candidate in candidates:
+        try:
+            dumps = _load_json_backend(candidate)
+        except (ImportError, ValueError):
+            if name:
+                raise
+            logger.debug("JSON backend %s unavailable, trying next", candidate)
+            continue
+        _json_backend_name, _json_dumps = candidate, dumps
+        break
+    return _json_backend_name
+
+
+def get_json_backend() -> str:
+    """Return the name of the serializer backend in use."""
+    if _json_dumps is _resolve_json_backend:
+        set_json_backend()
+    return _json_backend_name
+
+
+def encode_json(obj: Any) -> bytes:
+    """Serialize obj to compact UTF-8 JSON with the active backend."""
+    return _json_dumps(obj)
+
+
 def json_response(
-    body: dict[str, Any] | list[Any],
+    body: dict[str, Any] | list[Any] | bytes,
     status_code: int = 200,
     headers: dict[str, str] | None = None,
 ) -> dict[str, Any]:
     """Build an API Gateway response with JSON body and CORS headers.
 
     Args:
-        body: Response body (will be JSON-serialized).
+        body: Response body. Dicts and lists are JSON-serialized with the
+            active backend; bytes are treated as already-encoded UTF-8 JSON.
         status_code: HTTP status code.
         headers: Optional additional headers (merged with CORS_HEADERS).
 
@@ -38,17 +151,117 @@ def json_response(
     merged_headers = {**CORS_HEADERS}
     if headers:
         merged_headers.update(headers)
+    payload = body if isinstance(body, bytes) else _json_dumps(body)
     return {
         "statusCode": status_code,
         "headers": merged_headers,
-        "body": json.dumps(body),
+        "body": payload.decode("utf-8"),
     }
 
 
+class ProductFragmentCache:
+    """Pre-encoded JSON fragment for each catalog product, keyed by product ID.
+
+    Product dicts are treated as immutable once cached; a catalog reload
+    should hand the new product list to refresh() or rebuilt(), which
+    re-encode only the products that actually changed.
+
+    Attributes:
+        digest: CRC32 over all fragments in catalog order, as 8 hex chars.
+            Identical catalogs yield the same digest in every process.
+        encoded: Number of fragments (re-)encoded by the last refresh.
+    """
+
+    def __init__(self, products: list[dict[str, Any]] | None = None) -> None:
+        self._entries: dict[Any, tuple[dict[str, Any], bytes]] = {}
+        self.digest = "00000000"
+        self.encoded = 0
+        if products:
+            self.refresh(products)
+
+    def refresh(self, products: list[dict[str, Any]]) -> int:
+        """Sync the cache with a (re)loaded catalog.
+
+        Args:
+            products: Full product list of the new catalog.
+
+        Returns:
+            Number of products whose fragment had to be (re-)encoded.
+        """
+        entries = {}
+        encoded = 0
+        crc = 0
+        for product in products:
+            cached = self._entries.get(product["id"])
+            if cached is not None and cached[0] == product:
+                fragment = cached[1]
+            else:
+                fragment = _json_dumps(product)
+                encoded += 1
+            entries[product["id"]] = (product, fragment)
+            crc = zlib.crc32(fragment, crc)
+        self._entries = entries
+        self.digest = f"{crc:08x}"
+        self.encoded = encoded
+        return encoded
+
+    def get(self, product: dict[str, Any]) -> bytes:
+        """Return the encoded fragment for product, encoding it if not cached."""
+        cached = self._entries.get(product["id"])
+        if cached is not None and cached[0] is product:
+            return cached[1]
+        return _json_dumps(product)
+
+    def rebuilt(self, products: list[dict[str, Any]]) -> ProductFragmentCache:
+        """Return a new cache for products, reusing this cache's unchanged fragments.
+
+        Unlike refresh(), this cache is left untouched, so requests still
+        holding it keep consistent fragments.
+        """
+        cache = ProductFragmentCache()
+        cache._entries = self._entries
+        cache.refresh(products)
+        return cache
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def products_response(
+    key: str,
+    products: Sequence[dict[str, Any]],
+    extra: dict[str, Any] | None = None,
+    status_code: int = 200,
+    headers: dict[str, str] | None = None,
+    fragments: ProductFragmentCache | None = None,
+) -> dict[str, Any]:
+    """Build a JSON response whose ``key`` array is joined from cached product fragments.
+
+    Args:
+        key: Name of the product array in the body (e.g. "products").
+        products: Products to include, in order.
+        extra: Optional additional top-level fields, emitted after the array.
+        status_code: HTTP status code.
+        headers: Optional additional headers.
+        fragments: Fragment cache of the catalog the products come from. If
+            None, each product is encoded in full.
+
+    Returns:
+        API Gateway response dict, same shape as json_response().
+    """
+    encoded = [fragments.get(p) for p in products] if fragments is not None else [_json_dumps(p) for p in products]
+    parts = [b"{", _json_dumps(key), b":[", b",".join(encoded), b"]"]
+    if extra:
+        parts += [b",", _json_dumps(extra)[1:-1]]
+    parts.append(b"}")
+    return json_response(b"".join(parts), status_code=status_code, headers=headers)
+
+
 def error_response(
     message: str,
     status_code: int = 500,
     error_code: str | None = None,
+    headers: dict[str, str] | None = None,
 ) -> dict[str, Any]:
     """Build an API Gateway error response with CORS headers.
 
@@ -56,6 +269,7 @@ def error_response(
         message: Error message for the client.
         status_code: HTTP status code.
         error_code: Optional error code for programmatic handling.
+        headers: Optional additional headers (e.g. Allow on a 405).
 
     Returns:
         API Gateway response dict.
@@ -63,7 +277,439 @@ def error_response(
     body: dict[str, Any] = {"error": message}
     if error_code:
         body["code"] = error_code
-    return json_response(body, status_code=status_code)
+    return json_response(body, status_code=status_code, headers=headers)
+
+
+def get_header(event: dict[str, Any], name: str) -> str | None:
+    """Case-insensitive lookup of a request header in an API Gateway event."""
+    headers = event.get("headers") or {}
+    value = headers.get(name)
+    if value is None:
+        lowered = name.lower()
+        for key, candidate in headers.items():
+            if key.lower() == lowered:
+                return candidate
+    return value
+
+
+def compute_etag(route: str, params: dict[str, Any] | None, generation: str) -> str:
+    """Build a weak ETag from the catalog generation and the normalized query.
+
+    Parameter order, surrounding whitespace and empty values do not affect
+    the tag, so equivalent queries share one cache entry. No body hashing is
+    involved; the tag only changes when the catalog generation does.
+
+    Args:
+        route: Route name (e.g. "search").
+        params: Query string parameters of the request.
+        generation: Generation of the catalog serving the request.
+
+    Returns:
+        ETag header value, e.g. ``W/"1a2b3c4d-0011223344556677"``.
+    """
+    normalized = "&".join(
+        f"{key}={str(value).strip()}"
+        for key, value in sorted((params or {}).items())
+        if value is not None and str(value).strip()
+    )
+    import hashlib
+
+    query_hash = hashlib.blake2b(f"{route}?{normalized}".encode("utf-8"), digest_size=8).hexdigest()
+    return f'W/"{generation}-{query_hash}"'
+
+
+def etag_matches(event: dict[str, Any], etag: str) -> bool:
+    """Return True if the request's If-None-Match header matches etag (weak comparison)."""
+    if_none_match = get_header(event, "If-None-Match")
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def cache_control_for(route: str, default: str = "no-cache") -> str:
+    """Return the Cache-Control value for a route.
+
+    Overridable per route with the CACHE_CONTROL_<ROUTE> env var, e.g.
+    ``CACHE_CONTROL_SEARCH="public, max-age=300"``.
+    """
+    return os.environ.get(f"CACHE_CONTROL_{route.upper()}", default)
+
+
+def not_modified_response(headers: dict[str, str] | None = None) -> dict[str, Any]:
+    """Build a 304 Not Modified response with no body.
+
+    Args:
+        headers: Validator headers to repeat (ETag, Cache-Control).
+
+    Returns:
+        API Gateway response dict.
+    """
+    merged_headers = {**CORS_HEADERS}
+    if headers:
+        merged_headers.update(headers)
+    return {"statusCode": 304, "headers": merged_headers, "body": ""}
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer setting from the environment, falling back to default."""
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        logger.warning("Ignoring non-integer %s=%r", name, os.environ.get(name))
+        return default
+
+
+# Response compression settings (see compress_response)
+COMPRESSION_MIN_BYTES = _env_int("COMPRESSION_MIN_BYTES", 1024)
+GZIP_LEVEL = _env_int("COMPRESSION_GZIP_LEVEL", 6)
+BROTLI_QUALITY = _env_int("COMPRESSION_BROTLI_QUALITY", 4)
+
+_brotli: Any = None
+
+
+def load_brotli() -> Any:
+    """Import the optional brotli module on first use; returns None if not installed."""
+    global _brotli
+    if _brotli is None:
+        try:
+            import brotli
+        except ImportError:
+            brotli = False
+        _brotli = brotli
+    return _brotli or None
+
+
+def _accepted_encodings(accept_encoding: str) -> dict[str, float]:
+    """Parse an Accept-Encoding header into {coding: qvalue}."""
+    accepted: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = q
+    return accepted
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Pick the best supported content coding ("br" or "gzip") the client accepts."""
+    if not accept_encoding:
+        return None
+    accepted = _accepted_encodings(accept_encoding)
+    wildcard = accepted.get("*", 0.0)
+    supported = ("br", "gzip") if load_brotli() is not None else ("gzip",)
+    best, best_q = None, 0.0
+    for coding in supported:
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress_body(data: bytes, encoding: str) -> bytes:
+    """Compress data with the given content coding using the configured level."""
+    if encoding == "br":
+        return load_brotli().compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def compress_response(
+    event: dict[str, Any],
+    response: dict[str, Any],
+    min_bytes: int | None = None,
+) -> dict[str, Any]:
+    """Compress a response body according to the request's Accept-Encoding.
+
+    Only successful bodies of at least min_bytes are compressed; 304
+    responses get the Vary header the full response would carry. The
+    compressed body is base64-encoded and flagged with isBase64Encoded, as
+    API Gateway expects for binary payloads.
+
+    Args:
+        event: API Gateway event of the request.
+        response: Response dict from json_response() or products_response().
+        min_bytes: Size threshold; defaults to COMPRESSION_MIN_BYTES.
+
+    Returns:
+        The response, compressed in place if eligible.
+    """
+    if response.get("statusCode") == 304:
+        # The ETag is the same for every coding, so a 304 must repeat Vary for
+        # shared caches to revalidate the right variant
+        response.setdefault("headers", {})["Vary"] = "Accept-Encoding"
+        return response
+    body = response.get("body")
+    if response.get("statusCode") != 200 or not body or response.get("isBase64Encoded"):
+        return response
+    data = body.encode("utf-8")
+    if len(data) < (COMPRESSION_MIN_BYTES if min_bytes is None else min_bytes):
+        return response
+
+    headers = response.setdefault("headers", {})
+    headers["Vary"] = "Accept-Encoding"
+    encoding = negotiate_encoding(get_header(event, "Accept-Encoding"))
+    if encoding is None:
+        return response
+
+    headers["Content-Encoding"] = encoding
+    response["body"] = base64.b64encode(compress_body(data, encoding)).decode("ascii")
+    response["isBase64Encoded"] = True
+    return response
+
+
+# A route handler takes the API Gateway event and returns the response dict.
+# Middleware wraps a handler: middleware(event, call_next) -> response.
+Handler = Callable[[dict[str, Any]], dict[str, Any]]
+Middleware = Callable[[dict[str, Any], Handler], dict[str, Any]]
+
+
+def compression_middleware(event: dict[str, Any], call_next: Handler) -> dict[str, Any]:
+    """Route middleware: compress the handler's response (see compress_response)."""
+    return compress_response(event, call_next(event))
+
+
+def cache_control_middleware(route: str, default: str) -> Middleware:
+    """Route middleware factory: add the route's Cache-Control to 200 and 304 responses.
+
+    The value is resolved once, when the router is built (see cache_control_for).
+    """
+    value = cache_control_for(route, default)
+
+    def middleware(event: dict[str, Any], call_next: Handler) -> dict[str, Any]:
+        response = call_next(event)
+        if response.get("statusCode") in (200, 304):
+            response.setdefault("headers", {})["Cache-Control"] = value
+        return response
+
+    return middleware
+
+
+def request_method(event: dict[str, Any]) -> str:
+    """HTTP method of a REST (v1) or HTTP API (v2) event."""
+    return event.get("requestContext", {}).get("http", {}).get("method") or event.get("httpMethod", "GET")
+
+
+def request_path(event: dict[str, Any]) -> str:
+    """Request path of an event, without the HTTP API stage prefix or a trailing slash."""
+    path = event.get("rawPath") or event.get("path") or "/"
+    stage = event.get("requestContext", {}).get("stage")
+    if stage and stage != "$default" and event.get("rawPath") and path.startswith(f"/{stage}/"):
+        path = path[len(stage) + 1:]
+    if len(path) > 1 and path.endswith("/"):
+        path = path.rstrip("/") or "/"
+    return path
+
+
+class _Route:
+    """A compiled route: per-method handlers with their middleware already applied."""
+
+    __slots__ = ("path", "methods", "allow")
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.methods: dict[str, Handler] = {}
+        self.allow = ""
+
+
+class _TrieNode:
+    """Prefix trie node over path segments, for routes with {param} segments."""
+
+    __slots__ = ("children", "param", "param_name", "greedy_name", "greedy_route", "route")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _TrieNode] = {}
+        self.param: _TrieNode | None = None
+        self.param_name = ""
+        self.greedy_name = ""
+        self.greedy_route: _Route | None = None
+        self.route: _Route | None = None
+
+
+def _options_response(event: dict[str, Any]) -> dict[str, Any]:
+    """CORS preflight: the CORS headers on an empty 204."""
+    return json_response({}, status_code=204)
+
+
+def _head(get: Handler) -> Handler:
+    """HEAD for a GET route: the GET response (status and headers) without its body."""
+
+    def handler(event: dict[str, Any]) -> dict[str, Any]:
+        return {**get(event), "body": ""}
+
+    return handler
+
+
+def _wrap(middleware: Middleware, inner: Handler) -> Handler:
+    def handler(event: dict[str, Any]) -> dict[str, Any]:
+        return middleware(event, inner)
+
+    return handler
+
+
+def _chain(handler: Handler, middleware: Sequence[Middleware]) -> Handler:
+    """Wrap handler in middleware; the first middleware is the outermost."""
+    for wrap in reversed(middleware):
+        handler = _wrap(wrap, handler)
+    return handler
+
+
+class Router:
+    """Table-driven request router shared by the Lambda handlers.
+
+    Routes are registered with add() or the route() decorator and compiled
+    on first dispatch: static paths into one dict lookup, and paths with
+    API Gateway style ``{param}`` / trailing ``{proxy+}`` segments into a
+    small prefix trie. Matched parameters are merged into the event's
+    ``pathParameters``. Each route answers OPTIONS (CORS preflight) itself,
+    answers HEAD with its GET handler minus the body, returns 405 with an Allow header for other unregistered methods, and
+    unknown paths get 404.
+
+    Middleware (see Middleware) is composed per route at compile time, so
+    dispatch costs one lookup and the handler chain. With PROFILE_REQUESTS
+    set, the shared.profiling hook is added as every route's outermost
+    middleware.
+    """
+
+    def __init__(self) -> None:
+        self._table: list[tuple[str, tuple[str, ...], Handler, tuple[Middleware, ...]]] = []
+        # (exact routes, trie) built by compile(), published in one assignment
+        self._compiled: tuple[dict[str, _Route], _TrieNode] | None = None
+        self._compile_lock = threading.Lock()
+
+    def add(
+        self,
+        path: str,
+        handler: Handler,
+        methods: Sequence[str] = ("GET",),
+        middleware: Sequence[Middleware] = (),
+    ) -> None:
+        """Register handler for path and methods, wrapped in middleware (outermost first)."""
+        self._table.append((path, tuple(m.upper() for m in methods), handler, tuple(middleware)))
+        self._compiled = None
+
+    def route(
+        self, path: str, methods: Sequence[str] = ("GET",), middleware: Sequence[Middleware] = ()
+    ) -> Callable[[Handler], Handler]:
+        """Decorator form of add()."""
+
+        def register(handler: Handler) -> Handler:
+            self.add(path, handler, methods, middleware)
+            return handler
+
+        return register
+
+    def compile(self) -> tuple[dict[str, _Route], _TrieNode]:
+        """Build the lookup structures from the route table, once.
+
+        Runs on the first dispatch, possibly on several request threads at
+        once: the structures are built under a lock and published together,
+        so no thread sees a partly built table.
+        """
+        with self._compile_lock:
+            if self._compiled is None:
+                self._compiled = self._build()
+            return self._compiled
+
+    def _build(self) -> tuple[dict[str, _Route], _TrieNode]:
+        exact: dict[str, _Route] = {}
+        trie = _TrieNode()
+        routes: dict[str, _Route] = {}
+        # Opt-in request profiling (shared.profiling); when off the hook is not installed at all
+        profile = os.environ.get("PROFILE_REQUESTS", "off").lower() != "off"
+        if profile:
+            from shared.profiling import profiling_middleware, request_profiler
+
+            profile = request_profiler().enabled
+        for path, methods, handler, middleware in self._table:
+            compiled = routes.get(path)
+            if compiled is None:
+                compiled = routes[path] = _Route(path)
+                if "{" in path:
+                    self._insert(trie, path, compiled)
+                else:
+                    exact[path] = compiled
+            if profile:
+                middleware = (profiling_middleware(path),) + middleware
+            chained = _chain(handler, middleware)
+            for method in methods:
+                compiled.methods[method] = chained
+        for compiled in routes.values():
+            compiled.methods.setdefault("OPTIONS", _options_response)
+            if "GET" in compiled.methods:
+                compiled.methods.setdefault("HEAD", _head(compiled.methods["GET"]))
+            compiled.allow = ", ".join(sorted(compiled.methods))
+        return exact, trie
+
+    def _insert(self, node: _TrieNode, path: str, compiled: _Route) -> None:
+        segments = path.strip("/").split("/")
+        for i, segment in enumerate(segments):
+            if segment.startswith("{") and segment.endswith("+}"):
+                if i != len(segments) - 1:
+                    raise ValueError(f"Greedy segment must be last: {path}")
+                node.greedy_name = segment[1:-2]
+                node.greedy_route = compiled
+                return
+            if segment.startswith("{") and segment.endswith("}"):
+                name = segment[1:-1]
+                if node.param is None:
+                    node.param, node.param_name = _TrieNode(), name
+                elif node.param_name != name:
+                    raise ValueError(f"Conflicting parameter names at {path}")
+                node = node.param
+            else:
+                node = node.children.setdefault(segment, _TrieNode())
+        node.route = compiled
+
+    def match(self, path: str) -> tuple[_Route | None, dict[str, str]]:
+        """Find the route for a normalized path, with its path parameters."""
+        exact, trie = self._compiled or self.compile()
+        compiled = exact.get(path)
+        if compiled is not None:
+            return compiled, {}
+        return self._match_trie(trie, path.strip("/").split("/"), 0, {})
+
+    def _match_trie(
+        self, node: _TrieNode, segments: list[str], i: int, params: dict[str, str]
+    ) -> tuple[_Route | None, dict[str, str]]:
+        if i == len(segments):
+            return node.route, params
+        segment = segments[i]
+        child = node.children.get(segment)
+        if child is not None:
+            found = self._match_trie(child, segments, i + 1, params)
+            if found[0] is not None:
+                return found
+        if node.param is not None and segment:
+            found = self._match_trie(node.param, segments, i + 1, {**params, node.param_name: segment})
+            if found[0] is not None:
+                return found
+        if node.greedy_route is not None:
+            return node.greedy_route, {**params, node.greedy_name: "/".join(segments[i:])}
+        return None, params
+
+    def dispatch(self, event: dict[str, Any]) -> dict[str, Any]:
+        """Route an API Gateway event to its handler and return the response."""
+        compiled, params = self.match(request_path(event))
+        if compiled is None:
+            return error_response("Not found", status_code=404, error_code="NOT_FOUND")
+        handler = compiled.methods.get(request_method(event).upper())
+        if handler is None:
+            return error_response(
+                "Method not allowed", status_code=405, error_code="METHOD_NOT_ALLOWED", headers={"Allow": compiled.allow}
+            )
+        if params:
+            event = {**event, "pathParameters": {**(event.get("pathParameters") or {}), **params}}
+        return handler(event)
 
 
 def get_trace_context() -> dict[str, str]:
@@ -86,580 +732,3 @@ def get_trace_context() -> dict[str, str]:
     except Exception as e:
         logger.debug("Could not extract trace context: %s", e)
     return {}
-
-
-# Mock product data - same 50 products as Java order service (DataSeeder)
-PRODUCTS: list[dict[str, Any]] = [
-    {
-        "id": 1,
-        "name": "Wireless Noise-Cancelling Headphones",
-        "description": "Premium over-ear headphones with active noise cancellation and 30-hour battery life",
-        "price": 299.99,
-        "imageUrl": "/images/products/wireless-noise-cancelling-headphones.svg",
-        "category": "Electronics",
-        "stockQuantity": 50,
-        "sku": "ELEC-001",
-        "slug": "wireless-noise-cancelling-headphones",
-    },
-    {
-        "id": 2,
-        "name": "Ultra-Slim Laptop 15\"",
-        "description": "Lightweight 15-inch laptop with 16GB RAM and 512GB SSD",
-        "price": 1299.99,
-        "imageUrl": "/images/products/ultra-slim-laptop-15.svg",
-        "category": "Electronics",
-        "stockQuantity": 25,
-        "sku": "ELEC-002",
-        "slug": "ultra-slim-laptop-15",
-    },
-    {
-        "id": 3,
-        "name": "Smart Watch Pro",
-        "description": "Advanced fitness tracking, heart rate monitoring, and 7-day battery life",
-        "price": 399.99,
-        "imageUrl": "/images/products/smart-watch-pro.svg",
-        "category": "Electronics",
-        "stockQuantity": 75,
-        "sku": "ELEC-003",
-        "slug": "smart-watch-pro",
-    },
-    {
-        "id": 4,
-        "name": "4K Action Camera",
-        "description": "Waterproof action camera with 4K video and image stabilization",
-        "price": 249.99,
-        "imageUrl": "/images/products/4k-action-camera.svg",
-        "category": "Electronics",
-        "stockQuantity": 40,
-        "sku": "ELEC-004",
-        "slug": "4k-action-camera",
-    },
-    {
-        "id": 5,
-        "name": "Premium Cotton T-Shirt",
-        "description": "100% organic cotton, comfortable fit, available in multiple colors",
-        "price": 39.99,
-        "imageUrl": "/images/products/premium-cotton-tshirt.svg",
-        "category": "Clothing",
-        "stockQuantity": 200,
-        "sku": "CLTH-001",
-        "slug": "premium-cotton-tshirt",
-    },
-    {
-        "id": 6,
-        "name": "Leather Crossbody Bag",
-        "description": "Handcrafted genuine leather bag with adjustable strap",
-        "price": 89.99,
-        "imageUrl": "/images/products/leather-crossbody-bag.svg",
-        "category": "Clothing",
-        "stockQuantity": 60,
-        "sku": "CLTH-002",
-        "slug": "leather-crossbody-bag",
-    },
-    {
-        "id": 7,
-        "name": "Running Shoes Ultra",
-        "description": "Lightweight running shoes with responsive cushioning",
-        "price": 129.99,
-        "imageUrl": "/images/products/running-shoes-ultra.svg",
-        "category": "Clothing",
-        "stockQuantity": 80,
-        "sku": "CLTH-003",
-        "slug": "running-shoes-ultra",
-    },
-    {
-        "id": 8,
-        "name": "Denim Jacket Classic",
-        "description": "Timeless denim jacket with a comfortable relaxed fit",
-        "price": 79.99,
-        "imageUrl": "/images/products/denim-jacket-classic.svg",
-        "category": "Clothing",
-        "stockQuantity": 45,
-        "sku": "CLTH-004",
-        "slug": "denim-jacket-classic",
-    },
-    {
-        "id": 9,
-        "name": "Robot Vacuum Cleaner",
-        "description": "Smart mapping, app control, and self-emptying base",
-        "price": 449.99,
-        "imageUrl": "/images/products/robot-vacuum-cleaner.svg",
-        "category": "Home & Kitchen",
-        "stockQuantity": 30,
-        "sku": "HOME-001",
-        "slug": "robot-vacuum-cleaner",
-    },
-    {
-        "id": 10,
-        "name": "Stainless Steel Cookware Set",
-        "description": "10-piece set with induction-compatible pots and pans",
-        "price": 199.99,
-        "imageUrl": "/images/products/stainless-steel-cookware-set.svg",
-        "category": "Home & Kitchen",
-        "stockQuantity": 35,
-        "sku": "HOME-002",
-        "slug": "stainless-steel-cookware-set",
-    },
-    {
-        "id": 11,
-        "name": "Yoga Mat Premium",
-        "description": "Extra thick non-slip mat with carrying strap",
-        "price": 49.99,
-        "imageUrl": "/images/products/yoga-mat-premium.svg",
-        "category": "Sports",
-        "stockQuantity": 100,
-        "sku": "SPRT-001",
-        "slug": "yoga-mat-premium",
-    },
-    {
-        "id": 12,
-        "name": "Mountain Bike Helmet",
-        "description": "Ventilated helmet with MIPS technology for enhanced safety",
-        "price": 69.99,
-        "imageUrl": "/images/products/mountain-bike-helmet.svg",
-        "category": "Sports",
-        "stockQuantity": 90,
-        "sku": "SPRT-002",
-        "slug": "mountain-bike-helmet",
-    },
-    {
-        "id": 13,
-        "name": "Bluetooth Speaker Mini",
-        "description": "Compact portable speaker with 12-hour battery and rich bass",
-        "price": 59.99,
-        "imageUrl": "/images/products/bluetooth-speaker-mini.svg",
-        "category": "Electronics",
-        "stockQuantity": 120,
-        "sku": "ELEC-005",
-        "slug": "bluetooth-speaker-mini",
-    },
-    {
-        "id": 14,
-        "name": "Wireless Earbuds Pro",
-        "description": "True wireless earbuds with active noise cancellation",
-        "price": 149.99,
-        "imageUrl": "/images/products/wireless-earbuds-pro.svg",
-        "category": "Electronics",
-        "stockQuantity": 85,
-        "sku": "ELEC-006",
-        "slug": "wireless-earbuds-pro",
-    },
-    {
-        "id": 15,
-        "name": "Tablet 10\"",
-        "description": "10-inch tablet with HD display and 64GB storage",
-        "price": 279.99,
-        "imageUrl": "/images/products/tablet-10.svg",
-        "category": "Electronics",
-        "stockQuantity": 55,
-        "sku": "ELEC-007",
-        "slug": "tablet-10",
-    },
-    {
-        "id": 16,
-        "name": "Mechanical Keyboard RGB",
-        "description": "Gaming mechanical keyboard with customizable RGB lighting",
-        "price": 119.99,
-        "imageUrl": "/images/products/mechanical-keyboard-rgb.svg",
-        "category": "Electronics",
-        "stockQuantity": 70,
-        "sku": "ELEC-008",
-        "slug": "mechanical-keyboard-rgb",
-    },
-    {
-        "id": 17,
-        "name": "Wool Sweater Classic",
-        "description": "Soft merino wool sweater, perfect for cool weather",
-        "price": 89.99,
-        "imageUrl": "/images/products/wool-sweater-classic.svg",
-        "category": "Clothing",
-        "stockQuantity": 65,
-        "sku": "CLTH-005",
-        "slug": "wool-sweater-classic",
-    },
-    {
-        "id": 18,
-        "name": "Canvas Backpack",
-        "description": "Sturdy canvas backpack with laptop compartment",
-        "price": 54.99,
-        "imageUrl": "/images/products/canvas-backpack.svg",
-        "category": "Clothing",
-        "stockQuantity": 95,
-        "sku": "CLTH-006",
-        "slug": "canvas-backpack",
-    },
-    {
-        "id": 19,
-        "name": "Athletic Shorts",
-        "description": "Moisture-wicking athletic shorts with built-in liner",
-        "price": 34.99,
-        "imageUrl": "/images/products/athletic-shorts.svg",
-        "category": "Clothing",
-        "stockQuantity": 150,
-        "sku": "CLTH-007",
-        "slug": "athletic-shorts",
-    },
-    {
-        "id": 20,
-        "name": "Winter Parka",
-        "description": "Insulated winter parka with hood and multiple pockets",
-        "price": 159.99,
-        "imageUrl": "/images/products/winter-parka.svg",
-        "category": "Clothing",
-        "stockQuantity": 40,
-        "sku": "CLTH-008",
-        "slug": "winter-parka",
-    },
-    {
-        "id": 21,
-        "name": "Espresso Machine",
-        "description": "Compact espresso maker with milk frother",
-        "price": 189.99,
-        "imageUrl": "/images/products/espresso-machine.svg",
-        "category": "Home & Kitchen",
-        "stockQuantity": 45,
-        "sku": "HOME-003",
-        "slug": "espresso-machine",
-    },
-    {
-        "id": 22,
-        "name": "Air Fryer XL",
-        "description": "Large capacity air fryer with digital controls",
-        "price": 129.99,
-        "imageUrl": "/images/products/air-fryer-xl.svg",
-        "category": "Home & Kitchen",
-        "stockQuantity": 60,
-        "sku": "HOME-004",
-        "slug": "air-fryer-xl",
-    },
-    {
-        "id": 23,
-        "name": "Blender Pro",
-        "description": "High-speed blender for smoothies and soups",
-        "price": 99.99,
-        "imageUrl": "/images/products/blender-pro.svg",
-        "category": "Home & Kitchen",
-        "stockQuantity": 75,
-        "sku": "HOME-005",
-        "slug": "blender-pro",
-    },
-    {
-        "id": 24,
-        "name": "Coffee Grinder Burr",
-        "description": "Electric burr grinder with 15 grind settings",
-        "price": 69.99,
-        "imageUrl": "/images/products/coffee-grinder-burr.svg",
-        "category": "Home & Kitchen",
-        "stockQuantity": 80,
-        "sku": "HOME-006",
-        "slug": "coffee-grinder-burr",
-    },
-    {
-        "id": 25,
-        "name": "Kitchen Knife Set",
-        "description": "8-piece chef knife set with wooden block",
-        "price": 149.99,
-        "imageUrl": "/images/products/kitchen-knife-set.svg",
-        "category": "Home & Kitchen",
-        "stockQuantity": 35,
-        "sku": "HOME-007",
-        "slug": "kitchen-knife-set",
-    },
-    {
-        "id": 26,
-        "name": "Food Storage Containers",
-        "description": "20-piece BPA-free food storage container set",
-        "price": 44.99,
-        "imageUrl": "/images/products/food-storage-containers.svg",
-        "category": "Home & Kitchen",
-        "stockQuantity": 110,
-        "sku": "HOME-008",
-        "slug": "food-storage-containers",
-    },
-    {
-        "id": 27,
-        "name": "Resistance Bands Set",
-        "description": "Set of 5 resistance bands with different tension levels",
-        "price": 24.99,
-        "imageUrl": "/images/products/resistance-bands-set.svg",
-        "category": "Sports",
-        "stockQuantity": 130,
-        "sku": "SPRT-003",
-        "slug": "resistance-bands-set",
-    },
-    {
-        "id": 28,
-        "name": "Dumbbells Pair 10lb",
-        "description": "Adjustable dumbbells with rubber coating",
-        "price": 79.99,
-        "imageUrl": "/images/products/dumbbells-pair-10lb.svg",
-        "category": "Sports",
-        "stockQuantity": 55,
-        "sku": "SPRT-004",
-        "slug": "dumbbells-pair-10lb",
-    },
-    {
-        "id": 29,
-        "name": "Tennis Racket Pro",
-        "description": "Professional tennis racket with carbon fiber frame",
-        "price": 119.99,
-        "imageUrl": "/images/products/tennis-racket-pro.svg",
-        "category": "Sports",
-        "stockQuantity": 45,
-        "sku": "SPRT-005",
-        "slug": "tennis-racket-pro",
-    },
-    {
-        "id": 30,
-        "name": "Running Armband",
-        "description": "Phone holder armband for running and workouts",
-        "price": 19.99,
-        "imageUrl": "/images/products/running-armband.svg",
-        "category": "Sports",
-        "stockQuantity": 180,
-        "sku": "SPRT-006",
-        "slug": "running-armband",
-    },
-    {
-        "id": 31,
-        "name": "Foam Roller",
-        "description": "High-density foam roller for muscle recovery",
-        "price": 34.99,
-        "imageUrl": "/images/products/foam-roller.svg",
-        "category": "Sports",
-        "stockQuantity": 95,
-        "sku": "SPRT-007",
-        "slug": "foam-roller",
-    },
-    {
-        "id": 32,
-        "name": "Jump Rope Speed",
-        "description": "Weighted speed jump rope for cardio training",
-        "price": 29.99,
-        "imageUrl": "/images/products/jump-rope-speed.svg",
-        "category": "Sports",
-        "stockQuantity": 120,
-        "sku": "SPRT-008",
-        "slug": "jump-rope-speed",
-    },
-    {
-        "id": 33,
-        "name": "The Art of Programming",
-        "description": "Comprehensive guide to clean code and software design",
-        "price": 24.99,
-        "imageUrl": "/images/products/the-art-of-programming.svg",
-        "category": "Books",
-        "stockQuantity": 85,
-        "sku": "BOOK-001",
-        "slug": "the-art-of-programming",
-    },
-    {
-        "id": 34,
-        "name": "Cookbook Essentials",
-        "description": "500 essential recipes for home cooks",
-        "price": 19.99,
-        "imageUrl": "/images/products/cookbook-essentials.svg",
-        "category": "Books",
-        "stockQuantity": 95,
-        "sku": "BOOK-002",
-        "slug": "cookbook-essentials",
-    },
-    {
-        "id": 35,
-        "name": "Travel Photography Guide",
-        "description": "Tips and techniques for stunning travel photos",
-        "price": 16.99,
-        "imageUrl": "/images/products/travel-photography-guide.svg",
-        "category": "Books",
-        "stockQuantity": 70,
-        "sku": "BOOK-003",
-        "slug": "travel-photography-guide",
-    },
-    {
-        "id": 36,
-        "name": "Self-Help Best Seller",
-        "description": "Bestselling guide to personal growth and productivity",
-        "price": 14.99,
-        "imageUrl": "/images/products/self-help-best-seller.svg",
-        "category": "Books",
-        "stockQuantity": 150,
-        "sku": "BOOK-004",
-        "slug": "self-help-best-seller",
-    },
-    {
-        "id": 37,
-        "name": "Mystery Novel Collection",
-        "description": "Thrilling mystery series box set",
-        "price": 29.99,
-        "imageUrl": "/images/products/mystery-novel-collection.svg",
-        "category": "Books",
-        "stockQuantity": 45,
-        "sku": "BOOK-005",
-        "slug": "mystery-novel-collection",
-    },
-    {
-        "id": 38,
-        "name": "Children's Storybook",
-        "description": "Illustrated storybook for ages 4-8",
-        "price": 12.99,
-        "imageUrl": "/images/products/childrens-storybook.svg",
-        "category": "Books",
-        "stockQuantity": 200,
-        "sku": "BOOK-006",
-        "slug": "childrens-storybook",
-    },
-    {
-        "id": 39,
-        "name": "Vitamin C Serum",
-        "description": "Anti-aging serum with 20% vitamin C",
-        "price": 34.99,
-        "imageUrl": "/images/products/vitamin-c-serum.svg",
-        "category": "Beauty",
-        "stockQuantity": 90,
-        "sku": "BEAU-001",
-        "slug": "vitamin-c-serum",
-    },
-    {
-        "id": 40,
-        "name": "Hydrating Face Cream",
-        "description": "Deep moisturizing cream for all skin types",
-        "price": 28.99,
-        "imageUrl": "/images/products/hydrating-face-cream.svg",
-        "category": "Beauty",
-        "stockQuantity": 110,
-        "sku": "BEAU-002",
-        "slug": "hydrating-face-cream",
-    },
-    {
-        "id": 41,
-        "name": "Lipstick Set",
-        "description": "Set of 6 long-lasting lipstick shades",
-        "price": 24.99,
-        "imageUrl": "/images/products/lipstick-set.svg",
-        "category": "Beauty",
-        "stockQuantity": 75,
-        "sku": "BEAU-003",
-        "slug": "lipstick-set",
-    },
-    {
-        "id": 42,
-        "name": "Hair Dryer Professional",
-        "description": "Salon-quality hair dryer with ionic technology",
-        "price": 79.99,
-        "imageUrl": "/images/products/hair-dryer-professional.svg",
-        "category": "Beauty",
-        "stockQuantity": 50,
-        "sku": "BEAU-004",
-        "slug": "hair-dryer-professional",
-    },
-    {
-        "id": 43,
-        "name": "Essential Oil Diffuser",
-        "description": "Ultrasonic aromatherapy diffuser with LED lights",
-        "price": 39.99,
-        "imageUrl": "/images/products/essential-oil-diffuser.svg",
-        "category": "Beauty",
-        "stockQuantity": 85,
-        "sku": "BEAU-005",
-        "slug": "essential-oil-diffuser",
-    },
-    {
-        "id": 44,
-        "name": "Nail Polish Collection",
-        "description": "Set of 10 long-wear nail polish colors",
-        "price": 18.99,
-        "imageUrl": "/images/products/nail-polish-collection.svg",
-        "category": "Beauty",
-        "stockQuantity": 120,
-        "sku": "BEAU-006",
-        "slug": "nail-polish-collection",
-    },
-    {
-        "id": 45,
-        "name": "Board Game Strategy",
-        "description": "Award-winning family strategy board game",
-        "price": 34.99,
-        "imageUrl": "/images/products/board-game-strategy.svg",
-        "category": "Toys & Games",
-        "stockQuantity": 65,
-        "sku": "TOYS-001",
-        "slug": "board-game-strategy",
-    },
-    {
-        "id": 46,
-        "name": "Building Blocks Set",
-        "description": "500-piece construction building blocks set",
-        "price": 49.99,
-        "imageUrl": "/images/products/building-blocks-set.svg",
-        "category": "Toys & Games",
-        "stockQuantity": 55,
-        "sku": "TOYS-002",
-        "slug": "building-blocks-set",
-    },
-    {
-        "id": 47,
-        "name": "Puzzle 1000 Pieces",
-        "description": "Landscape jigsaw puzzle, 1000 pieces",
-        "price": 19.99,
-        "imageUrl": "/images/products/puzzle-1000-pieces.svg",
-        "category": "Toys & Games",
-        "stockQuantity": 80,
-        "sku": "TOYS-003",
-        "slug": "puzzle-1000-pieces",
-    },
-    {
-        "id": 48,
-        "name": "Remote Control Car",
-        "description": "1:18 scale RC car with 2.4GHz control",
-        "price": 59.99,
-        "imageUrl": "/images/products/remote-control-car.svg",
-        "category": "Toys & Games",
-        "stockQuantity": 45,
-        "sku": "TOYS-004",
-        "slug": "remote-control-car",
-    },
-    {
-        "id": 49,
-        "name": "Card Game Party",
-        "description": "Fast-paced party card game for 4-12 players",
-        "price": 14.99,
-        "imageUrl": "/images/products/card-game-party.svg",
-        "category": "Toys & Games",
-        "stockQuantity": 140,
-        "sku": "TOYS-005",
-        "slug": "card-game-party",
-    },
-    {
-        "id": 50,
-        "name": "Plush Toy Bear",
-        "description": "Soft plush teddy bear, 12 inches",
-        "price": 24.99,
-        "imageUrl": "/images/products/plush-toy-bear.svg",
-        "category": "Toys & Games",
-        "stockQuantity": 95,
-        "sku": "TOYS-006",
-        "slug": "plush-toy-bear",
-    },
-    {
-        "id": 51,
-        "name": "Albertxidil Hair Growth Serum",
-        "description": "Revolutionary hair and beard growth formula. Grow a magnificent mane and a legendary beard in weeks. Clinically tested, Albert-approved.",
-        "price": 49.99,
-        "imageUrl": "/images/products/albertxidil.svg",
-        "category": "Beauty",
-        "stockQuantity": 200,
-        "sku": "BEAU-007",
-        "slug": "albertxidil",
-    },
-    {
-        "id": 52,
-        "name": "Enzodol Max Force Pain Relief",
-        "description": "The legendary ointment by Enzo. One rub and pain runs away screaming. Formulated with volcanic thermal extract, capsaicin turbo blend, and Enzo's secret ingredient. Apply generously and feel the burn before the relief.",
-        "price": 34.99,
-        "imageUrl": "/images/products/enzodol.svg",
-        "category": "Beauty",
-        "stockQuantity": 300,
-        "sku": "BEAU-008",
-        "slug": "enzodol-max-force",
-    },
-]
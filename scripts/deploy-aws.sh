@@ -196,6 +196,8 @@ echo "═══ [5/7] Deploying Python Lambda functions... ═══"
 LAMBDA_ZIP="/tmp/rumshop-lambdas.zip"
 cd "${PROJECT_ROOT}/backend/python-lambdas"
 rm -f "$LAMBDA_ZIP"
+# Precompiled catalog artifact (shared/catalog.pkl) so cold starts skip index building
+python3 -m shared.catalog compile
 zip -r "$LAMBDA_ZIP" shared/ search/ recommendations/ notifications/ -x '*__pycache__*' '*.pyc'
 
 for func in search recommendations notifications; do